@@ -5,8 +5,17 @@ from flask import Flask
 from flask_cors import CORS
 import os
 from src.extension.db import init_db, login_manager
-from src.models import User
+from src.extension.metrics import request_metrics
+from src.extension.query_audit import query_audit
+from src.extension.pool import build_engine_options, pool_status, pool_telemetry
+from src.extension.sqlite import configure_sqlite
 from src.routes import register_routes
+from src.routes.decorators import jwt_claims
+from src.services.images import image_pipeline
+from src.services.jobs import job_queue
+from src.services.order_feed import order_feed
+from src.services.upload_stats import upload_stats
+from src.services.user_cache import init_user_cache, load_cached_user, current_token_version, user_cache
 
 
 def create_app(config=None):
@@ -26,20 +35,121 @@ def create_app(config=None):
     app.config["JWT_SECRET_KEY"] = config.get("JWT_SECRET_KEY", "jwt_dev_secret_key") if config else "jwt_dev_secret_key"
     app.config["SQLALCHEMY_DATABASE_URI"] = config.get("SQLALCHEMY_DATABASE_URI", "sqlite:///site.db") if config else "sqlite:///site.db"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Connection pool settings (ignored for SQLite)
+    app.config["DB_POOL_SIZE"] = config.get("DB_POOL_SIZE", 10) if config else 10
+    app.config["DB_MAX_OVERFLOW"] = config.get("DB_MAX_OVERFLOW", 20) if config else 20
+    app.config["DB_POOL_TIMEOUT"] = config.get("DB_POOL_TIMEOUT", 30) if config else 30
+    app.config["DB_POOL_RECYCLE"] = config.get("DB_POOL_RECYCLE", 280) if config else 280  # Below MySQL's wait_timeout
+    app.config["DB_POOL_PRE_PING"] = config.get("DB_POOL_PRE_PING", True) if config else True
+    engine_options = build_engine_options(app.config)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = config.get("SQLALCHEMY_ENGINE_OPTIONS", engine_options) if config else engine_options
+    # SQLite profile applied on every new connection (ignored for other databases)
+    app.config["SQLITE_JOURNAL_MODE"] = config.get("SQLITE_JOURNAL_MODE", "WAL") if config else "WAL"
+    app.config["SQLITE_BUSY_TIMEOUT"] = config.get("SQLITE_BUSY_TIMEOUT", 5000) if config else 5000  # Milliseconds
+    app.config["SQLITE_SYNCHRONOUS"] = config.get("SQLITE_SYNCHRONOUS", "NORMAL") if config else "NORMAL"
+    app.config["SQLITE_CACHE_SIZE"] = config.get("SQLITE_CACHE_SIZE", -64000) if config else -64000  # Negative = KiB
+    app.config["SQLITE_MMAP_SIZE"] = config.get("SQLITE_MMAP_SIZE", 268435456) if config else 268435456  # Bytes
+    # Password hashing: bcrypt cost and the worker pool that runs it
+    app.config["BCRYPT_LOG_ROUNDS"] = config.get("BCRYPT_LOG_ROUNDS", 12) if config else 12
+    app.config["PASSWORD_HASH_WORKERS"] = config.get("PASSWORD_HASH_WORKERS", None) if config else None  # None = CPU count
+    app.config["PASSWORD_HASH_QUEUE"] = config.get("PASSWORD_HASH_QUEUE", 16) if config else 16  # Waiting jobs before 503
+    app.config["PASSWORD_HASH_TIMEOUT"] = config.get("PASSWORD_HASH_TIMEOUT", 10) if config else 10
+    # Identity cache used by the user loader (TTL 0 disables it)
+    app.config["USER_CACHE_SIZE"] = config.get("USER_CACHE_SIZE", 1024) if config else 1024
+    app.config["USER_CACHE_TTL"] = config.get("USER_CACHE_TTL", 60) if config else 60
+    # Seconds a worker may keep accepting a revoked JWT (0 = check the database on every request)
+    app.config["TOKEN_VERSION_TTL"] = config.get("TOKEN_VERSION_TTL", 5) if config else 5
+    # Upload image pipeline: variant widths in pixels (rendered by the job queue)
+    app.config["IMAGE_VARIANT_WIDTHS"] = config.get("IMAGE_VARIANT_WIDTHS", {"thumb": 320, "medium": 768, "full": 1600}) if config else {"thumb": 320, "medium": 768, "full": 1600}
+    app.config["IMAGE_QUALITY"] = config.get("IMAGE_QUALITY", 82) if config else 82
+    # Seconds a missing variant manifest is remembered before looking for it again
+    app.config["IMAGE_MANIFEST_MISS_TTL"] = config.get("IMAGE_MANIFEST_MISS_TTL", 10) if config else 10
+    # Upload serving: "x-accel" (nginx) or "x-sendfile" hands the bytes to the front proxy (None = Flask streams them)
+    app.config["UPLOAD_OFFLOAD"] = config.get("UPLOAD_OFFLOAD", None) if config else None
+    app.config["UPLOAD_ACCEL_PREFIX"] = config.get("UPLOAD_ACCEL_PREFIX", "/protected-uploads/") if config else "/protected-uploads/"
+    # Coupons: seconds the code index is cached, and rows each coupon's usage limit is split across
+    app.config["COUPON_INDEX_TTL"] = config.get("COUPON_INDEX_TTL", 30) if config else 30
+    app.config["COUPON_SHARDS"] = config.get("COUPON_SHARDS", 8) if config else 8
+    # Reservations: seats, slot size, how long a table is held and opening hours (Monday first, None = closed)
+    app.config["RESERVATION_CAPACITY"] = config.get("RESERVATION_CAPACITY", 40) if config else 40
+    app.config["RESERVATION_SLOT_MINUTES"] = config.get("RESERVATION_SLOT_MINUTES", 15) if config else 15
+    app.config["RESERVATION_DURATION_MINUTES"] = config.get("RESERVATION_DURATION_MINUTES", 90) if config else 90
+    app.config["RESERVATION_OPENING_HOURS"] = config.get("RESERVATION_OPENING_HOURS", [("11:00", "23:00")] * 7) if config else [("11:00", "23:00")] * 7
+    # Kitchen order feed: "local" (single worker) or "database" (every worker tails order_event)
+    app.config["ORDER_FEED_PUBSUB"] = config.get("ORDER_FEED_PUBSUB", "local") if config else "local"
+    app.config["ORDER_FEED_POLL_INTERVAL"] = config.get("ORDER_FEED_POLL_INTERVAL", 1.0) if config else 1.0
+    app.config["ORDER_FEED_HEARTBEAT"] = config.get("ORDER_FEED_HEARTBEAT", 15) if config else 15
+    app.config["ORDER_FEED_REPLAY_LIMIT"] = config.get("ORDER_FEED_REPLAY_LIMIT", 500) if config else 500
+    # Ids below the cursor re-scanned for events that committed out of id order
+    app.config["ORDER_FEED_LAG_WINDOW"] = config.get("ORDER_FEED_LAG_WINDOW", 200) if config else 200
+    # Background jobs: worker threads started in each web process (0 = only run_jobs workers), polling and retries
+    app.config["JOB_INLINE_WORKERS"] = config.get("JOB_INLINE_WORKERS", 1) if config else 1
+    app.config["JOB_POLL_INTERVAL"] = config.get("JOB_POLL_INTERVAL", 2.0) if config else 2.0
+    app.config["JOB_MAX_ATTEMPTS"] = config.get("JOB_MAX_ATTEMPTS", 5) if config else 5
+    app.config["JOB_RETRY_BASE"] = config.get("JOB_RETRY_BASE", 5) if config else 5  # Seconds, doubled per attempt
+    app.config["JOB_RETRY_MAX"] = config.get("JOB_RETRY_MAX", 3600) if config else 3600
+    app.config["JOB_LEASE_SECONDS"] = config.get("JOB_LEASE_SECONDS", 300) if config else 300  # Running jobs older than this are retaken
+    # Request/SQL instrumentation exported at /metrics (bucket bounds in seconds, statements and bytes)
+    app.config["METRICS_ENABLED"] = config.get("METRICS_ENABLED", True) if config else True
+    app.config["METRICS_LATENCY_BUCKETS"] = config.get("METRICS_LATENCY_BUCKETS", (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)) if config else (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    app.config["METRICS_QUERY_BUCKETS"] = config.get("METRICS_QUERY_BUCKETS", (0, 1, 2, 5, 10, 20, 50, 100, 200)) if config else (0, 1, 2, 5, 10, 20, 50, 100, 200)
+    app.config["METRICS_SIZE_BUCKETS"] = config.get("METRICS_SIZE_BUCKETS", (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)) if config else (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+    # N+1 detection: None = on in debug mode; flags statement shapes repeated more than THRESHOLD times per request
+    app.config["QUERY_AUDIT"] = config.get("QUERY_AUDIT", None) if config else None
+    app.config["QUERY_AUDIT_THRESHOLD"] = config.get("QUERY_AUDIT_THRESHOLD", 5) if config else 5
+    app.config["QUERY_AUDIT_STRICT"] = config.get("QUERY_AUDIT_STRICT", False) if config else False  # Raise NPlusOneError instead of logging
+    # Seconds a cached public menu snapshot may be served before it is rebuilt (0 = until invalidated)
+    app.config["MENU_CACHE_TTL"] = config.get("MENU_CACHE_TTL", 60) if config else 60
+    # Seconds the admin dashboard stats are cached per process
+    app.config["DASHBOARD_STATS_TTL"] = config.get("DASHBOARD_STATS_TTL", 5) if config else 5
+    # Seconds before the in-memory order price index is reloaded (0 = until invalidated)
+    app.config["PRICE_INDEX_TTL"] = config.get("PRICE_INDEX_TTL", 60) if config else 60
     
     # Initialize extensions
     db, login_manager_instance, bcrypt, jwt = init_db(app)
     
+    with app.app_context():
+        configure_sqlite(db.engine, app.config)
+        # Registered first so request timing covers every other hook
+        request_metrics.init_app(app, db.engine)
+        query_audit.init_app(app, db.engine)
+    
     # Configure login manager user loader
+    init_user_cache(app)
+    image_pipeline.init_app(app)
+    order_feed.init_app(app)
+    job_queue.init_app(app)
+    
+    # Existing telemetry, exported as gauges next to the request metrics
+    request_metrics.register_collector("db_pool", lambda: pool_status(db.engine))
+    request_metrics.register_collector("db_pool_waits", pool_telemetry.snapshot)
+    request_metrics.register_collector("user_cache", user_cache.stats)
+    request_metrics.register_collector("uploads", upload_stats.snapshot)
+    request_metrics.register_collector("jobs", lambda: job_queue.stats(db.session))
+    request_metrics.register_collector("order_feed", lambda: {"subscribers": len(order_feed.broadcaster)})
+    
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return load_cached_user(int(user_id))
+    
+    # Bearer tokens authenticate requests that carry no session cookie
+    @login_manager.request_loader
+    def load_user_from_request(request):
+        claims = jwt_claims()
+        return load_cached_user(int(claims["sub"])) if claims else None
+    
+    # Tokens are revoked when the user's token_version moves past the one they carry
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        version = current_token_version(int(jwt_payload["sub"]))
+        return version is None or version != jwt_payload.get("tv")
     
     # CORS configuration
     CORS(
         app,
         supports_credentials=True,
         origins=["http://localhost:5173", "http://127.0.0.1:5173"],
+        expose_headers=["ETag", "X-Next-Cursor", "X-Order-Feed-Cursor"],
     )
     
     # Create uploads directory if it doesn't exist
@@ -2,6 +2,7 @@
 Extensions package
 """
 from src.extension.db import db, login_manager, bcrypt, jwt, init_db
+from src.extension.hashing import password_hasher, HasherSaturated, HasherTimeout
 
-__all__ = ['db', 'login_manager', 'bcrypt', 'jwt', 'init_db']
+__all__ = ['db', 'login_manager', 'bcrypt', 'jwt', 'init_db', 'password_hasher', 'HasherSaturated', 'HasherTimeout']
 
@@ -25,5 +25,8 @@ def init_db(app):
     bcrypt.init_app(app)
     jwt.init_app(app)
     
+    from src.extension.hashing import password_hasher
+    password_hasher.init_app(app)
+    
     return db, login_manager, bcrypt, jwt
 
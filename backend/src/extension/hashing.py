@@ -0,0 +1,83 @@
+"""
+Password hashing offloaded to a bounded worker pool
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from src.extension.db import bcrypt
+
+
+class HasherSaturated(Exception):
+    """Raised when too many hash operations are already queued"""
+
+
+class HasherTimeout(HasherSaturated):
+    """Raised when a hash did not finish within ``PASSWORD_HASH_TIMEOUT``"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small thread pool with a cap on queued work.
+
+    bcrypt releases the GIL while hashing, so the pool keeps CPU-heavy
+    hashing off the request threads' interpreter time and bounds how many
+    hashes run at once. Submissions beyond ``PASSWORD_HASH_QUEUE`` raise
+    ``HasherSaturated`` instead of piling up, and waits longer than
+    ``PASSWORD_HASH_TIMEOUT`` raise ``HasherTimeout``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.workers = 2
+        self.capacity = threading.BoundedSemaphore(16)
+        self.timeout = 10
+        self.rounds = 12
+
+    def init_app(self, app):
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS") or os.cpu_count() or 2
+        self.capacity = threading.BoundedSemaphore(self.workers + app.config.get("PASSWORD_HASH_QUEUE", 16))
+        self.timeout = app.config.get("PASSWORD_HASH_TIMEOUT", 10)
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+
+    def _get_executor(self):
+        # Created lazily and per process so forked workers get their own threads
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        capacity = self.capacity
+        if not capacity.acquire(blocking=False):
+            raise HasherSaturated()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            capacity.release()
+            raise
+        # Freed when the work is finished or cancelled, not when the caller gives up waiting
+        future.add_done_callback(lambda _: capacity.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()  # Drops it if it never started
+            raise HasherTimeout()
+
+    def hash(self, password):
+        """Hash ``password`` with the configured cost"""
+        return self._run(lambda p: bcrypt.generate_password_hash(p, self.rounds).decode("utf-8"), password)
+
+    def check(self, password_hash, password):
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if ``password_hash`` was made with a different cost than configured"""
+        try:
+            return int(password_hash.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,186 @@
+"""
+Request and SQL instrumentation exported in the Prometheus text format
+"""
+import threading
+import time
+from bisect import bisect_left
+from flask import request
+from sqlalchemy import event
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+REQUEST_LABELS = ("blueprint", "endpoint", "method")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by a tuple of label values (not thread-safe on its own)"""
+
+    def __init__(self, name, help_text, buckets, label_names=REQUEST_LABELS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = label_names
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class RequestMetrics:
+    """Per-endpoint latency, response size and SQL usage for this process.
+
+    Hooks only touch a thread-local while a request runs; the shared series
+    are updated once per request under a single lock. Other telemetry
+    (pool waits, caches, uploads) is folded in through ``register_collector``
+    and read at scrape time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._collectors = {}
+        self._requests = {}
+        self.enabled = True
+        self.started = time.time()
+        self.configure()
+
+    def configure(self, latency_buckets=DEFAULT_LATENCY_BUCKETS, query_buckets=DEFAULT_QUERY_BUCKETS,
+                  size_buckets=DEFAULT_SIZE_BUCKETS):
+        with self._lock:
+            self._requests = {}
+            self.latency = Histogram(
+                "http_request_duration_seconds", "Time spent handling the request.", latency_buckets)
+            self.size = Histogram(
+                "http_response_size_bytes", "Response body size (streamed responses excluded).", size_buckets)
+            self.queries = Histogram(
+                "http_request_db_queries", "SQL statements executed per request.", query_buckets)
+            self.db_time = Histogram(
+                "http_request_db_seconds", "Time spent in SQL statements per request.", latency_buckets)
+
+    def init_app(self, app, engine):
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        self.configure(
+            app.config.get("METRICS_LATENCY_BUCKETS", DEFAULT_LATENCY_BUCKETS),
+            app.config.get("METRICS_QUERY_BUCKETS", DEFAULT_QUERY_BUCKETS),
+            app.config.get("METRICS_SIZE_BUCKETS", DEFAULT_SIZE_BUCKETS),
+        )
+        if not self.enabled:
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def register_collector(self, name, collect):
+        """Export the numeric values of ``collect()`` as ``app_<name>_<key>`` gauges"""
+        self._collectors[name] = collect
+
+    # Hooks
+
+    def _before_request(self):
+        local = self._local
+        local.active = True
+        local.queries = 0
+        local.db_time = 0.0
+        local.started = time.perf_counter()
+
+    def _after_request(self, response):
+        local = self._local
+        if not getattr(local, "active", False):
+            return response
+        elapsed = time.perf_counter() - local.started
+        local.active = False
+        labels = (request.blueprint or "", request.endpoint or "<unmatched>", request.method)
+        size = None if response.is_streamed else response.content_length
+        with self._lock:
+            key = labels + (str(response.status_code),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self.latency.observe(labels, elapsed)
+            self.queries.observe(labels, local.queries)
+            self.db_time.observe(labels, local.db_time)
+            if size is not None:
+                self.size.observe(labels, size)
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, not the connection: after_cursor_execute
+        # never fires for a statement that raises, and the context dies with it
+        if context is not None and getattr(self._local, "active", False):
+            context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        local = self._local
+        if getattr(local, "active", False):
+            local.queries += 1
+            local.db_time += time.perf_counter() - started
+
+    # Exposition
+
+    def render(self):
+        """Everything collected so far in the Prometheus text format (version 0.0.4)"""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Requests handled, by endpoint and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for labels, count in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{_labels(REQUEST_LABELS + ('status',), labels)} {count}")
+            for histogram in (self.latency, self.size, self.queries, self.db_time):
+                lines.extend(histogram.render())
+        lines += [
+            "# HELP process_start_time_seconds Start time of this process since the Unix epoch.",
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {_number(self.started)}",
+        ]
+        for name, collect in sorted(self._collectors.items()):
+            try:
+                values = collect()
+            except Exception as e:
+                print(f"Error collecting {name} metrics: {e}")
+                continue
+            for key, value in sorted(values.items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"app_{name}_{key}"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,87 @@
+"""
+N+1 query detection for development and test runs
+"""
+import re
+import threading
+import traceback
+from flask import current_app, request
+from sqlalchemy import event
+
+SRC_DIR = re.compile(r"[\\/]src[\\/](?!extension[\\/]query_audit)")
+IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneError(AssertionError):
+    """Raised in strict mode when a request repeats one statement shape too often"""
+
+
+def fingerprint(statement):
+    """Statement shape with IN-lists and whitespace collapsed; parameters are already placeholders"""
+    return IN_LIST.sub("IN (...)", WHITESPACE.sub(" ", statement).strip())
+
+
+def _stack_sample(limit=6):
+    # Innermost application frames, skipping SQLAlchemy/Flask internals
+    frames = [f for f in traceback.extract_stack()[:-3] if SRC_DIR.search(f.filename)]
+    return "".join(traceback.format_list(frames[-limit:]))
+
+
+class QueryAudit:
+    """Counts statement shapes per request and reports those run more than ``threshold`` times.
+
+    ``QUERY_AUDIT`` turns it on (None follows ``app.debug``). Each repeated
+    shape is logged with the route, the statement and a stack sample taken
+    when it first crossed the threshold. With ``QUERY_AUDIT_STRICT`` the
+    request raises ``NPlusOneError`` instead, which the test client
+    propagates so the offending test fails.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def init_app(self, app, engine):
+        if app.config.get("QUERY_AUDIT") is False:
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def _before_request(self):
+        app = current_app
+        enabled = app.config.get("QUERY_AUDIT")
+        self._local.active = app.debug if enabled is None else enabled
+        if self._local.active:
+            self._local.threshold = app.config.get("QUERY_AUDIT_THRESHOLD", 5)
+            self._local.counts = {}
+            self._local.samples = {}
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        local = self._local
+        if not getattr(local, "active", False):
+            return
+        shape = fingerprint(statement)
+        count = local.counts.get(shape, 0) + 1
+        local.counts[shape] = count
+        if count == local.threshold + 1:
+            local.samples[shape] = _stack_sample()
+
+    def _after_request(self, response):
+        local = self._local
+        if not getattr(local, "active", False):
+            return response
+        local.active = False
+        if not local.samples:
+            return response
+        route = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+        reports = [
+            f"{local.counts[shape]}x {shape}\n{sample}".rstrip() for shape, sample in local.samples.items()
+        ]
+        message = f"Possible N+1 queries in {route} ({request.endpoint}):\n" + "\n".join(reports)
+        if current_app.config.get("QUERY_AUDIT_STRICT"):
+            raise NPlusOneError(message)
+        current_app.logger.warning(message)
+        return response
+
+
+query_audit = QueryAudit()
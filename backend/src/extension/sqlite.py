@@ -0,0 +1,44 @@
+"""
+SQLite production profile: pragmas applied on every new connection, plus maintenance
+"""
+from sqlalchemy import event
+
+
+def sqlite_pragmas(config):
+    """Ordered ``(pragma, value)`` pairs from the ``SQLITE_*`` settings"""
+    return [
+        ("journal_mode", config["SQLITE_JOURNAL_MODE"]),
+        ("busy_timeout", config["SQLITE_BUSY_TIMEOUT"]),
+        ("synchronous", config["SQLITE_SYNCHRONOUS"]),
+        ("cache_size", config["SQLITE_CACHE_SIZE"]),
+        ("mmap_size", config["SQLITE_MMAP_SIZE"]),
+    ]
+
+
+def configure_sqlite(engine, config):
+    """Register a connect hook applying the SQLite profile; no-op for other databases"""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = [(name, value) for name, value in sqlite_pragmas(config) if value is not None]
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def run_maintenance(engine):
+    """Checkpoint the WAL into the main database and refresh planner statistics.
+
+    Returns the ``wal_checkpoint`` result as ``(busy, log_frames, checkpointed_frames)``.
+    """
+    with engine.connect() as conn:
+        checkpoint = conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("PRAGMA optimize")
+        conn.commit()
+    return tuple(checkpoint) if checkpoint else None
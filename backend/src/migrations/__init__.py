@@ -0,0 +1,17 @@
+"""
+Migrations package - ordered list of schema migrations
+
+Each migration module exposes ``VERSION``, ``DESCRIPTION`` and
+``upgrade(conn)``. Append new modules to ``MIGRATIONS``; never reorder or
+edit one that has shipped.
+"""
+from src.migrations import m0001_legacy_columns, m0002_hot_query_indexes, m0003_user_token_version, m0004_job_rerun
+
+MIGRATIONS = [
+    m0001_legacy_columns,
+    m0002_hot_query_indexes,
+    m0003_user_token_version,
+    m0004_job_rerun,
+]
+
+__all__ = ['MIGRATIONS']
@@ -0,0 +1,46 @@
+"""
+EXPLAIN report for the hot queries the index migrations target
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+# (name, SQL template, params); {order} is replaced with the quoted order table name
+HOT_QUERIES = [
+    ("admin orders page", "SELECT id FROM {order} WHERE status = :status ORDER BY created_at DESC, id DESC LIMIT 50", {"status": "pending"}),
+    ("customer order history", "SELECT id FROM {order} WHERE user_id = :user_id ORDER BY created_at DESC", {"user_id": 1}),
+    ("orders in date range", "SELECT SUM(total_amount) FROM {order} WHERE created_at >= :since", {"since": None}),
+    ("order lines for order", "SELECT id FROM order_item WHERE order_id = :order_id", {"order_id": 1}),
+    ("reviews page", "SELECT id FROM review ORDER BY created_at DESC, id DESC LIMIT 50", {}),
+    ("reviews for menu item", "SELECT id FROM review WHERE menu_item_id = :item_id ORDER BY created_at DESC", {"item_id": 1}),
+    ("reviews for combo", "SELECT id FROM review WHERE combo_deal_id = :combo_id ORDER BY created_at DESC", {"combo_id": 1}),
+    ("reservations in range", "SELECT id FROM reservation WHERE reservation_time BETWEEN :start AND :end", {"start": None, "end": None}),
+    ("available menu", "SELECT id FROM menu_item WHERE availability = 1", {}),
+    ("menu items in category", "SELECT COUNT(*) FROM menu_item WHERE category = :category", {"category": "Burgers"}),
+    ("combos containing item", "SELECT DISTINCT combo_deal_id FROM combo_deal_item WHERE menu_item_id = :item_id", {"item_id": 1}),
+]
+
+
+def explain_hot_queries(conn):
+    """Return ``[(name, [plan lines])]`` using the dialect's EXPLAIN flavour"""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    order_table = conn.dialect.identifier_preparer.quote("order")
+    now = datetime.utcnow()
+    report = []
+    for name, sql, params in HOT_QUERIES:
+        params = dict(params)
+        for key in ("since", "start"):
+            if key in params:
+                params[key] = now - timedelta(days=7)
+        if "end" in params:
+            params["end"] = now
+        rows = conn.execute(text(prefix + sql.format(order=order_table)), params)
+        report.append((name, [" | ".join(str(v) for v in row) for row in rows]))
+    return report
+
+
+def print_report(title, report):
+    print(f"== {title} ==")
+    for name, lines in report:
+        print(f"-- {name}")
+        for line in lines:
+            print(f"   {line}")
@@ -0,0 +1,17 @@
+"""
+Columns previously added by hand with fix_db.py and add_combo_category.py
+"""
+from src.migrations.ops import add_column_if_missing
+
+VERSION = 1
+DESCRIPTION = "Add order_item.combo_deal_id and combo_deal.category"
+
+
+def upgrade(conn):
+    if add_column_if_missing(conn, "order_item", "combo_deal_id", "INTEGER DEFAULT NULL"):
+        # SQLite cannot add a foreign key to an existing table
+        if conn.dialect.name != "sqlite":
+            conn.exec_driver_sql(
+                "ALTER TABLE order_item ADD FOREIGN KEY (combo_deal_id) REFERENCES combo_deal(id)"
+            )
+    add_column_if_missing(conn, "combo_deal", "category", "VARCHAR(50)")
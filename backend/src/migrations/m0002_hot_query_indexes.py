@@ -0,0 +1,27 @@
+"""
+Indexes backing the listing, analytics and review queries
+"""
+from src.migrations.ops import create_index_if_missing
+
+VERSION = 2
+DESCRIPTION = "Add indexes for hot listing, analytics and review queries"
+
+INDEXES = [
+    ("ix_order_created_at", "order", ["created_at"]),
+    ("ix_order_user_id_created_at", "order", ["user_id", "created_at"]),
+    ("ix_order_status_created_at", "order", ["status", "created_at"]),
+    ("ix_order_item_order_id", "order_item", ["order_id"]),
+    ("ix_review_created_at", "review", ["created_at"]),
+    ("ix_review_menu_item_id_created_at", "review", ["menu_item_id", "created_at"]),
+    ("ix_review_combo_deal_id_created_at", "review", ["combo_deal_id", "created_at"]),
+    ("ix_reservation_reservation_time", "reservation", ["reservation_time"]),
+    ("ix_menu_item_availability", "menu_item", ["availability"]),
+    ("ix_menu_item_category", "menu_item", ["category"]),
+    ("ix_combo_deal_item_combo_deal_id", "combo_deal_item", ["combo_deal_id"]),
+    ("ix_combo_deal_item_menu_item_id", "combo_deal_item", ["menu_item_id"]),
+]
+
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index_if_missing(conn, name, table, columns)
@@ -0,0 +1,11 @@
+"""
+Token version used to revoke issued JWTs
+"""
+from src.migrations.ops import add_column_if_missing
+
+VERSION = 3
+DESCRIPTION = "Add user.token_version"
+
+
+def upgrade(conn):
+    add_column_if_missing(conn, "user", "token_version", "INTEGER NOT NULL DEFAULT 0")
@@ -0,0 +1,11 @@
+"""
+Rerun flag for jobs enqueued again while running
+"""
+from src.migrations.ops import add_column_if_missing
+
+VERSION = 4
+DESCRIPTION = "Add job.rerun"
+
+
+def upgrade(conn):
+    add_column_if_missing(conn, "job", "rerun", "BOOLEAN NOT NULL DEFAULT 0")
@@ -0,0 +1,30 @@
+"""
+Idempotent schema operations shared by migrations (SQLite and MySQL)
+"""
+from sqlalchemy import Index, MetaData, Table, inspect
+
+
+def has_table(conn, table):
+    return inspect(conn).has_table(table)
+
+
+def add_column_if_missing(conn, table, column, ddl_type):
+    """``ALTER TABLE ... ADD COLUMN`` unless the column already exists; returns True if added"""
+    if not has_table(conn, table):
+        return False
+    if column in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return False
+    quote = conn.dialect.identifier_preparer.quote
+    conn.exec_driver_sql(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(column)} {ddl_type}")
+    return True
+
+
+def create_index_if_missing(conn, name, table, columns):
+    """Create index ``name`` on ``table(columns)`` unless it exists; returns True if created"""
+    if not has_table(conn, table):
+        return False
+    if name in {i["name"] for i in inspect(conn).get_indexes(table)}:
+        return False
+    reflected = Table(table, MetaData(), autoload_with=conn)
+    Index(name, *(reflected.c[c] for c in columns)).create(conn)
+    return True
@@ -0,0 +1,44 @@
+"""
+Migration runner - applies pending migrations and records them in schema_migrations
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from src.migrations import MIGRATIONS
+
+# Kept out of db.metadata so db.create_all() never creates it implicitly
+metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def applied_versions(engine):
+    """Versions already recorded in schema_migrations"""
+    metadata.create_all(engine, tables=[schema_migrations])
+    with engine.connect() as conn:
+        return {row.version for row in conn.execute(select(schema_migrations.c.version))}
+
+
+def pending_migrations(engine):
+    applied = applied_versions(engine)
+    return [m for m in MIGRATIONS if m.VERSION not in applied]
+
+
+def migrate(engine, log=print):
+    """Apply every pending migration in order, each in its own transaction"""
+    applied = []
+    for migration in pending_migrations(engine):
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(insert(schema_migrations).values(
+                version=migration.VERSION,
+                description=migration.DESCRIPTION,
+                applied_at=datetime.utcnow(),
+            ))
+        log(f"Applied migration {migration.VERSION:04d}: {migration.DESCRIPTION}")
+        applied.append(migration.VERSION)
+    return applied
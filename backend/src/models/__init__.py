@@ -6,22 +6,37 @@ from src.models.user import User
 from src.models.menu_item import MenuItem
 from src.models.order import Order
 from src.models.order_item import OrderItem
+from src.models.order_event import OrderEvent
 from src.models.reservation import Reservation
+from src.models.reservation_slot import ReservationSlot
 from src.models.review import Review
 from src.models.coupon import Coupon
+from src.models.coupon_redemption import CouponShard, CouponRedemption
 from src.models.combo_deal import ComboDeal
 from src.models.combo_deal_item import ComboDealItem
+from src.models.combo_pricing import ComboPricing
 from src.models.category import Category
+from src.models.daily_sales import DailySales
+from src.models.rating_summary import RatingSummary
+from src.models.job import Job
 
 __all__ = [
     "User",
     "MenuItem",
     "Order",
     "OrderItem",
+    "OrderEvent",
     "Reservation",
+    "ReservationSlot",
     "Review",
     "Coupon",
+    "CouponShard",
+    "CouponRedemption",
     "ComboDeal",
     "ComboDealItem",
+    "ComboPricing",
     "Category",
+    "DailySales",
+    "RatingSummary",
+    "Job",
 ]
@@ -9,9 +9,9 @@ class ComboDealItem(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     combo_deal_id = db.Column(
-        db.Integer, db.ForeignKey("combo_deal.id"), nullable=False
+        db.Integer, db.ForeignKey("combo_deal.id"), nullable=False, index=True
     )
-    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), nullable=False)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), nullable=False, index=True)
     quantity = db.Column(db.Integer, default=1)
     menu_item = db.relationship("MenuItem")
 
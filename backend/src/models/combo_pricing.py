@@ -0,0 +1,22 @@
+"""
+ComboPricing model
+"""
+from datetime import datetime
+from src.extension.db import db
+
+
+class ComboPricing(db.Model):
+    """Materialized pricing read model for a combo deal.
+
+    Kept in sync by ``src.services.combo_pricing`` whenever a combo, one of
+    its items or a referenced menu item changes.
+    """
+
+    combo_deal_id = db.Column(
+        db.Integer, db.ForeignKey("combo_deal.id", ondelete="CASCADE"), primary_key=True
+    )
+    original_price = db.Column(db.Float, nullable=False, default=0)
+    savings = db.Column(db.Float, nullable=False, default=0)
+    category = db.Column(db.String(50), nullable=False, default="Mixed")
+    items = db.Column(db.JSON, nullable=False, default=list)  # Embedded item rows as served by /api/combos
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
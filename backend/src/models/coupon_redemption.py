@@ -0,0 +1,33 @@
+"""
+Coupon redemption models
+"""
+from datetime import datetime
+from src.extension.db import db
+
+
+class CouponShard(db.Model):
+    """One slice of a coupon's remaining redemptions.
+
+    A coupon's ``usage_limit`` is split across several rows so concurrent
+    checkouts decrement different rows instead of queueing on one.
+    """
+
+    coupon_id = db.Column(
+        db.Integer, db.ForeignKey("coupon.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard = db.Column(db.Integer, primary_key=True)
+    remaining = db.Column(db.Integer, nullable=False, default=0)
+
+
+class CouponRedemption(db.Model):
+    """Ledger row linking a coupon redemption to the order that used it"""
+
+    id = db.Column(db.Integer, primary_key=True)
+    coupon_id = db.Column(
+        db.Integer, db.ForeignKey("coupon.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    shard = db.Column(db.Integer, nullable=False)  # Shard the redemption was taken from
+    discount_amount = db.Column(db.Float, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
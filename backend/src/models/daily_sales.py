@@ -0,0 +1,22 @@
+"""
+DailySales model
+"""
+from src.extension.db import db
+
+
+class DailySales(db.Model):
+    """Per-day sales rollup, maintained incrementally as orders are placed"""
+
+    day = db.Column(db.Date, primary_key=True)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    # order_type split
+    pickup_orders = db.Column(db.Integer, nullable=False, default=0)
+    pickup_revenue = db.Column(db.Float, nullable=False, default=0)
+    delivery_orders = db.Column(db.Integer, nullable=False, default=0)
+    delivery_revenue = db.Column(db.Float, nullable=False, default=0)
+    # payment_method split
+    cash_orders = db.Column(db.Integer, nullable=False, default=0)
+    cash_revenue = db.Column(db.Float, nullable=False, default=0)
+    card_orders = db.Column(db.Integer, nullable=False, default=0)
+    card_revenue = db.Column(db.Float, nullable=False, default=0)
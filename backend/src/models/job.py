@@ -0,0 +1,28 @@
+"""
+Job model
+"""
+from datetime import datetime
+from src.extension.db import db
+
+
+class Job(db.Model):
+    """A unit of deferred work, run by ``src.services.jobs`` workers"""
+
+    __table_args__ = (
+        db.Index("ix_job_status_run_at", "status", "run_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)  # Registered task name
+    key = db.Column(db.String(200), unique=True, nullable=True)  # Idempotency key; same key = same job
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    rerun = db.Column(db.Boolean, nullable=False, default=False)  # Enqueued again while running; run once more
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Not before; pushed back on retry
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
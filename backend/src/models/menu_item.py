@@ -9,9 +9,9 @@ class MenuItem(db.Model):
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(500), nullable=True)
     price = db.Column(db.Float, nullable=False)
-    category = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False, index=True)
     image_url = db.Column(db.String(500), nullable=True)
     is_deal = db.Column(db.Boolean, default=False)
-    availability = db.Column(db.Boolean, default=True)
+    availability = db.Column(db.Boolean, default=True, index=True)
     reviews = db.relationship("Review", backref="item", lazy=True)
 
@@ -6,11 +6,17 @@ from src.extension.db import db
 
 
 class Order(db.Model):
+    __table_args__ = (
+        db.Index("ix_order_created_at", "created_at"),
+        db.Index("ix_order_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_order_status_created_at", "status", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     status = db.Column(
         db.String(20), default="pending"
-    )  # pending, preparing, ready, delivered, picked_up
+    )  # pending, accepted, preparing, ready, on_the_way, delivered, picked_up, denied, cancelled (see services/order_status.py)
     total_amount = db.Column(db.Float, nullable=False)
     payment_method = db.Column(db.String(20), nullable=False)  # cash, card
     order_type = db.Column(db.String(20), nullable=False)  # pickup, delivery
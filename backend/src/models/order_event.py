@@ -0,0 +1,19 @@
+"""
+OrderEvent model
+"""
+from datetime import datetime
+from src.extension.db import db
+
+
+class OrderEvent(db.Model):
+    """Append-only log of order changes pushed to the kitchen feed.
+
+    The autoincrement ``id`` is the feed's change cursor: a client that
+    reconnects with its last seen id replays everything after it.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)  # created, status
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
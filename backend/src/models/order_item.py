@@ -6,7 +6,7 @@ from src.extension.db import db
 
 class OrderItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False, index=True)
     menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), nullable=True)
     combo_deal_id = db.Column(db.Integer, db.ForeignKey("combo_deal.id"), nullable=True)
     name = db.Column(db.String(100), nullable=False)
@@ -0,0 +1,20 @@
+"""
+RatingSummary model
+"""
+from src.extension.db import db
+
+
+class RatingSummary(db.Model):
+    """Running rating totals for one menu item or combo deal"""
+
+    id = db.Column(db.Integer, primary_key=True)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), unique=True, nullable=True)
+    combo_deal_id = db.Column(db.Integer, db.ForeignKey("combo_deal.id"), unique=True, nullable=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    # Histogram of 1-5 star ratings
+    stars_1 = db.Column(db.Integer, nullable=False, default=0)
+    stars_2 = db.Column(db.Integer, nullable=False, default=0)
+    stars_3 = db.Column(db.Integer, nullable=False, default=0)
+    stars_4 = db.Column(db.Integer, nullable=False, default=0)
+    stars_5 = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,16 @@
+"""
+ReservationSlot model
+"""
+from src.extension.db import db
+
+
+class ReservationSlot(db.Model):
+    """Seats booked during one ``RESERVATION_SLOT_MINUTES`` slot.
+
+    A reservation occupies every slot its seating duration overlaps. Rows
+    are keyed by slot start, so availability for a time window is a single
+    primary-key range scan.
+    """
+
+    slot_start = db.Column(db.DateTime, primary_key=True)
+    booked = db.Column(db.Integer, nullable=False, default=0)
@@ -6,6 +6,12 @@ from src.extension.db import db
 
 
 class Review(db.Model):
+    __table_args__ = (
+        db.Index("ix_review_created_at", "created_at"),
+        db.Index("ix_review_menu_item_id_created_at", "menu_item_id", "created_at"),
+        db.Index("ix_review_combo_deal_id_created_at", "combo_deal_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), nullable=True)
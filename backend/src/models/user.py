@@ -12,6 +12,7 @@ class User(db.Model, UserMixin):
     password_hash = db.Column(db.String(128), nullable=False)
     address = db.Column(db.String(200), nullable=True)
     role = db.Column(db.String(10), default="customer")  # customer, admin
+    token_version = db.Column(db.Integer, nullable=False, default=0)  # Bumped to revoke issued JWTs
     orders = db.relationship("Order", backref="customer", lazy=True)
     reservations = db.relationship("Reservation", backref="customer", lazy=True)
     reviews = db.relationship("Review", backref="author", lazy=True)
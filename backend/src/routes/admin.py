@@ -2,23 +2,48 @@
 Admin routes
 """
 
-from flask import Blueprint, request, jsonify
-from flask_login import login_required, current_user
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from src.extension.db import db
-from src.models import User, Order, Reservation, MenuItem
-from datetime import datetime, timedelta
-from sqlalchemy import func, extract
+from src.extension.metrics import request_metrics
+from src.extension.pool import pool_status
+from src.models import User, Order, Reservation
+from src.routes.decorators import admin_required
+from src.routes.pagination import keyset_page, parse_date_range, paginated_response
+from src.services.dashboard import dashboard_stats
+from src.services.exports import csv_chunks, iter_order_lines, ndjson_chunks
+from src.services.jobs import job_queue
+from src.services.order_feed import latest_event_id, order_feed
+from src.services.order_status import transition_orders
+from src.services.reservations import book_seats, release_seats, slot_start, ReservationFull
+from src.services.sales_rollup import sales_series
+from src.services.upload_stats import upload_stats
+from src.services.user_cache import user_cache
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload, selectinload
 
 admin_bp = Blueprint("admin", __name__)
 
+MAX_BULK_ORDERS = 200
+
 
 @admin_bp.route("/api/admin/orders", methods=["GET"])
-@login_required
+@admin_required
 def admin_get_orders():
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
-    orders = Order.query.order_by(Order.created_at.desc()).all()
-    return jsonify(
+    # Read the feed head first so the live feed can resume from exactly this listing
+    feed_cursor = latest_event_id(db.session)
+    query = Order.query.options(joinedload(Order.customer), selectinload(Order.items))
+    status = request.args.get("status")
+    if status:
+        query = query.filter(Order.status == status)
+    try:
+        query = query.filter(*parse_date_range(request.args, Order.created_at))
+        orders, next_cursor = keyset_page(
+            query, request.args, Order.id, sort_column=Order.created_at
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    response = paginated_response(
         [
             {
                 "id": o.id,
@@ -33,29 +58,108 @@ def admin_get_orders():
                 ],
             }
             for o in orders
-        ]
+        ],
+        next_cursor,
     )
+    response.headers["X-Order-Feed-Cursor"] = str(feed_cursor)
+    return response
+
+
+@admin_bp.route("/api/admin/orders/feed", methods=["GET"])
+@admin_required
+def order_feed_stream():
+    """Server-Sent Events of order changes; resumes after ?cursor= or Last-Event-ID"""
+    cursor = request.args.get("cursor") or request.headers.get("Last-Event-ID")
+    try:
+        cursor = int(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
+    response = Response(stream_with_context(order_feed.stream(cursor)), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Let nginx pass events through unbuffered
+    return response
+
+
+@admin_bp.route("/api/admin/orders/export", methods=["GET"])
+@admin_required
+def export_orders():
+    export_format = request.args.get("format", "csv")
+    if export_format not in ("csv", "ndjson"):
+        return jsonify({"message": "format must be csv or ndjson"}), 400
+    try:
+        filters = parse_date_range(request.args, Order.created_at)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Rows are pulled through a server-side cursor while the response streams
+    partitions = iter_order_lines(db.engine, filters)
+    if export_format == "csv":
+        body, mimetype = csv_chunks(partitions), "text/csv"
+    else:
+        body, mimetype = ndjson_chunks(partitions), "application/x-ndjson"
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=orders.{export_format}"
+    return response
 
 
 @admin_bp.route("/api/admin/orders/<int:order_id>/status", methods=["PATCH"])
-@login_required
+@admin_required
 def update_order_status(order_id):
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
-    data = request.get_json()
-    order = Order.query.get_or_404(order_id)
-    order.status = data["status"]
+    data = request.get_json() or {}
+    try:
+        (result,) = transition_orders(db.session, [order_id], data.get("status"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    if not result["ok"]:
+        db.session.rollback()
+        return jsonify({"message": result["error"]}), 404 if result["error"] == "Order not found" else 409
     db.session.commit()
-    return jsonify({"message": f"Order status updated to {order.status}"}), 200
+    dashboard_stats.invalidate()
+    return jsonify({"message": f"Order status updated to {result['status']}"}), 200
+
+
+@admin_bp.route("/api/admin/orders/status", methods=["POST"])
+@admin_required
+def bulk_update_order_status():
+    """Apply one status to many orders in a single transaction.
+
+    Body: {"ids": [1, 2, 3], "status": "ready", "from": "preparing"}; "from"
+    is optional. Each order is reported as ok or with the reason it was skipped.
+    """
+    data = request.get_json() or {}
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        return jsonify({"message": "ids must be a non-empty list of order ids"}), 400
+    if len(ids) > MAX_BULK_ORDERS:
+        return jsonify({"message": f"At most {MAX_BULK_ORDERS} orders per request"}), 400
+    try:
+        results = transition_orders(db.session, ids, data.get("status"), data.get("from"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    db.session.commit()
+    dashboard_stats.invalidate()
+    return jsonify({
+        "updated": sum(1 for r in results if r["ok"]),
+        "conflicts": sum(1 for r in results if not r["ok"]),
+        "results": results,
+    }), 200
 
 
 @admin_bp.route("/api/admin/reservations", methods=["GET"])
-@login_required
+@admin_required
 def admin_get_reservations():
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
-    reservations = Reservation.query.order_by(Reservation.reservation_time.desc()).all()
-    return jsonify(
+    query = Reservation.query.options(joinedload(Reservation.customer))
+    status = request.args.get("status")
+    if status:
+        query = query.filter(Reservation.status == status)
+    try:
+        query = query.filter(*parse_date_range(request.args, Reservation.reservation_time))
+        reservations, next_cursor = keyset_page(
+            query, request.args, Reservation.id, sort_column=Reservation.reservation_time
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return paginated_response(
         [
             {
                 "id": r.id,
@@ -66,169 +170,84 @@ def admin_get_reservations():
                 "requests": r.special_requests,
             }
             for r in reservations
-        ]
+        ],
+        next_cursor,
     )
 
 
 @admin_bp.route("/api/admin/reservations/<int:res_id>/status", methods=["PATCH"])
-@login_required
+@admin_required
 def update_reservation_status(res_id):
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
-    data = request.get_json()
+    data = request.get_json() or {}
     res = Reservation.query.get_or_404(res_id)
-    res.status = data.get("status", res.status)
+    old_status, status = res.status, data.get("status", res.status)
+    if status == old_status:
+        return jsonify({"message": f"Reservation status updated to {status}"}), 200
+    # Only the request that actually moves the row adjusts the seat counters
+    moved = db.session.execute(
+        update(Reservation)
+        .where(Reservation.id == res_id, Reservation.status == old_status)
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not moved:
+        db.session.rollback()
+        return jsonify({"message": "Reservation was changed by another request, reload and retry"}), 409
+    start = slot_start(res.reservation_time)
+    if old_status == "confirmed":
+        release_seats(db.session, start, res.party_size)
+    elif status == "confirmed":
+        try:
+            book_seats(db.session, start, res.party_size)
+        except ReservationFull:
+            db.session.rollback()
+            return jsonify({"message": "Not enough seats available at that time"}), 409
     db.session.commit()
-    return jsonify({"message": f"Reservation status updated to {res.status}"}), 200
+    return jsonify({"message": f"Reservation status updated to {status}"}), 200
 
 
 @admin_bp.route("/api/admin/users", methods=["GET"])
-@login_required
+@admin_required
 def get_all_users():
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
-    users = User.query.all()
-    return jsonify(
+    # Users have no creation timestamp, so they are paged by id alone
+    query = User.query
+    role = request.args.get("role")
+    if role:
+        query = query.filter(User.role == role)
+    try:
+        users, next_cursor = keyset_page(query, request.args, User.id)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return paginated_response(
         [
             {"id": u.id, "username": u.username, "email": u.email, "role": u.role}
             for u in users
-        ]
+        ],
+        next_cursor,
     )
 
 
 @admin_bp.route("/api/admin/users/<int:user_id>/role", methods=["PATCH"])
-@login_required
+@admin_required
 def update_user_role(user_id):
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
     user = User.query.get_or_404(user_id)
     data = request.get_json()
-    user.role = data.get("role", "customer")
+    role = data.get("role", "customer")
+    if role != user.role:
+        user.role = role
+        user.token_version = (user.token_version or 0) + 1  # Revoke tokens carrying the old role
     db.session.commit()
+    user_cache.invalidate(user_id)
     return jsonify({"message": "User role updated"})
 
 
 @admin_bp.route("/api/admin/analytics/sales", methods=["GET"])
-@login_required
+@admin_required
 def get_sales_analytics():
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
 
     period = request.args.get("period", "day")  # day, week, month, year
 
-    now = datetime.utcnow()
-    data = []
-
-    if period == "day":
-        # Last 30 days
-        for i in range(29, -1, -1):
-            date = (now - timedelta(days=i)).date()
-            start = datetime.combine(date, datetime.min.time())
-            end = datetime.combine(date, datetime.max.time())
-
-            daily_sales = (
-                db.session.query(func.sum(Order.total_amount))
-                .filter(Order.created_at >= start, Order.created_at <= end)
-                .scalar()
-                or 0
-            )
-
-            daily_orders = Order.query.filter(
-                Order.created_at >= start, Order.created_at <= end
-            ).count()
-
-            data.append(
-                {
-                    "date": date.isoformat(),
-                    "sales": float(daily_sales),
-                    "orders": daily_orders,
-                    "label": date.strftime("%m/%d"),
-                }
-            )
-
-    elif period == "week":
-        # Last 12 weeks
-        for i in range(11, -1, -1):
-            week_start = now - timedelta(weeks=i + 1)
-            week_start = week_start - timedelta(days=week_start.weekday())
-            week_end = week_start + timedelta(days=6)
-
-            weekly_sales = (
-                db.session.query(func.sum(Order.total_amount))
-                .filter(Order.created_at >= week_start, Order.created_at <= week_end)
-                .scalar()
-                or 0
-            )
-
-            weekly_orders = Order.query.filter(
-                Order.created_at >= week_start, Order.created_at <= week_end
-            ).count()
-
-            data.append(
-                {
-                    "date": week_start.date().isoformat(),
-                    "sales": float(weekly_sales),
-                    "orders": weekly_orders,
-                    "label": f"Week {week_start.strftime('%m/%d')}",
-                }
-            )
-
-    elif period == "month":
-        # Last 12 months
-        for i in range(11, -1, -1):
-            month_start = datetime(now.year, now.month, 1) - timedelta(days=30 * i)
-            if month_start.month == 12:
-                month_end = datetime(month_start.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = datetime(
-                    month_start.year, month_start.month + 1, 1
-                ) - timedelta(days=1)
-
-            monthly_sales = (
-                db.session.query(func.sum(Order.total_amount))
-                .filter(Order.created_at >= month_start, Order.created_at <= month_end)
-                .scalar()
-                or 0
-            )
-
-            monthly_orders = Order.query.filter(
-                Order.created_at >= month_start, Order.created_at <= month_end
-            ).count()
-
-            data.append(
-                {
-                    "date": month_start.date().isoformat(),
-                    "sales": float(monthly_sales),
-                    "orders": monthly_orders,
-                    "label": month_start.strftime("%b %Y"),
-                }
-            )
-
-    elif period == "year":
-        # Last 5 years
-        for i in range(4, -1, -1):
-            year_start = datetime(now.year - i, 1, 1)
-            year_end = datetime(now.year - i, 12, 31, 23, 59, 59)
-
-            yearly_sales = (
-                db.session.query(func.sum(Order.total_amount))
-                .filter(Order.created_at >= year_start, Order.created_at <= year_end)
-                .scalar()
-                or 0
-            )
-
-            yearly_orders = Order.query.filter(
-                Order.created_at >= year_start, Order.created_at <= year_end
-            ).count()
-
-            data.append(
-                {
-                    "date": year_start.date().isoformat(),
-                    "sales": float(yearly_sales),
-                    "orders": yearly_orders,
-                    "label": str(year_start.year),
-                }
-            )
+    data = sales_series(db.session, period, datetime.utcnow().date())
 
     # Calculate totals and averages
     total_sales = sum(d["sales"] for d in data)
@@ -251,63 +270,39 @@ def get_sales_analytics():
 
 
 @admin_bp.route("/api/admin/analytics/stats", methods=["GET"])
-@login_required
+@admin_required
 def get_dashboard_stats():
-    if current_user.role != "admin":
-        return jsonify({"message": "Unauthorized"}), 403
-
-    now = datetime.utcnow()
-    today_start = datetime.combine(now.date(), datetime.min.time())
-    week_start = now - timedelta(days=7)
-    month_start = datetime(now.year, now.month, 1)
-
-    # Today's stats
-    today_sales = (
-        db.session.query(func.sum(Order.total_amount))
-        .filter(Order.created_at >= today_start)
-        .scalar()
-        or 0
-    )
-    today_orders = Order.query.filter(Order.created_at >= today_start).count()
-
-    # This week's stats
-    week_sales = (
-        db.session.query(func.sum(Order.total_amount))
-        .filter(Order.created_at >= week_start)
-        .scalar()
-        or 0
-    )
-    week_orders = Order.query.filter(Order.created_at >= week_start).count()
-
-    # This month's stats
-    month_sales = (
-        db.session.query(func.sum(Order.total_amount))
-        .filter(Order.created_at >= month_start)
-        .scalar()
-        or 0
-    )
-    month_orders = Order.query.filter(Order.created_at >= month_start).count()
 
-    # Total stats
-    total_sales = db.session.query(func.sum(Order.total_amount)).scalar() or 0
-    total_orders = Order.query.count()
-    total_users = User.query.count()
-    total_menu_items = MenuItem.query.count()
+    stats, meta = dashboard_stats.get(db.session)
+    return jsonify(dict(stats, meta=meta))
 
-    # Pending orders
-    pending_orders = Order.query.filter_by(status="pending").count()
 
-    return jsonify(
-        {
-            "today": {"sales": float(today_sales), "orders": today_orders},
-            "week": {"sales": float(week_sales), "orders": week_orders},
-            "month": {"sales": float(month_sales), "orders": month_orders},
-            "total": {
-                "sales": float(total_sales),
-                "orders": total_orders,
-                "users": total_users,
-                "menu_items": total_menu_items,
-                "pending_orders": pending_orders,
-            },
-        }
-    )
+@admin_bp.route("/api/admin/cache/users", methods=["GET"])
+@admin_required
+def get_user_cache_stats():
+    return jsonify(user_cache.stats())
+
+
+@admin_bp.route("/api/admin/db/pool", methods=["GET"])
+@admin_required
+def get_pool_status():
+    return jsonify(pool_status(db.engine))
+
+
+@admin_bp.route("/api/admin/uploads/stats", methods=["GET"])
+@admin_required
+def get_upload_stats():
+    return jsonify(upload_stats.snapshot())
+
+
+@admin_bp.route("/metrics", methods=["GET"])
+@admin_required
+def get_metrics():
+    # Prometheus scrapes this with an admin bearer token; numbers are per worker process
+    return Response(request_metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@admin_bp.route("/api/admin/jobs", methods=["GET"])
+@admin_required
+def get_job_stats():
+    return jsonify(job_queue.stats(db.session))
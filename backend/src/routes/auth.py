@@ -4,16 +4,28 @@ Authentication routes
 from flask import Blueprint, request, jsonify
 from flask_login import login_user, logout_user, current_user, login_required
 from flask_jwt_extended import create_access_token
-from src.extension.db import db, bcrypt
+from src.extension.db import db
+from src.extension.hashing import password_hasher, HasherSaturated
 from src.models import User
+from src.services.user_cache import user_cache
 
 auth_bp = Blueprint('auth', __name__)
 
 
+def hasher_busy():
+    """503 for a saturated or timed-out hasher (HasherTimeout is a HasherSaturated)"""
+    response = jsonify({'message': 'Server is busy, please try again shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
 @auth_bp.route('/api/auth/register', methods=['POST'])
 def register():
     data = request.get_json()
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    try:
+        hashed_password = password_hasher.hash(data['password'])
+    except HasherSaturated:
+        return hasher_busy()
     role = data.get('role', 'customer')  # Default to 'customer' if not provided
     # Validate role
     if role not in ['customer', 'admin']:
@@ -32,9 +44,24 @@ def register():
 def login():
     data = request.get_json()
     user = User.query.filter_by(email=data['email']).first()
-    if user and bcrypt.check_password_hash(user.password_hash, data['password']):
+    try:
+        valid = user is not None and password_hasher.check(user.password_hash, data['password'])
+    except HasherSaturated:
+        return hasher_busy()
+    if valid:
+        # Upgrade hashes made with an outdated cost while we have the plaintext
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.hash(data['password'])
+                db.session.commit()
+                user_cache.invalidate(user.id)
+            except HasherSaturated:
+                pass
         login_user(user)
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(
+            identity=str(user.id),
+            additional_claims={'role': user.role, 'tv': user.token_version},
+        )
         return jsonify({
             'message': 'Login successful', 
             'token': access_token,
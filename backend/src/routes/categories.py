@@ -2,9 +2,9 @@
 Category routes
 """
 from flask import Blueprint, request, jsonify
-from flask_login import login_required, current_user
 from src.extension.db import db
 from src.models import Category, MenuItem
+from src.routes.decorators import admin_required
 
 categories_bp = Blueprint('categories', __name__)
 
@@ -22,11 +22,9 @@ def get_categories():
 
 
 @categories_bp.route('/api/admin/categories', methods=['GET'])
-@login_required
+@admin_required
 def admin_get_categories():
     """Get all categories (including inactive) for admin"""
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     categories = Category.query.order_by(Category.name).all()
     return jsonify([{
         'id': c.id,
@@ -38,11 +36,9 @@ def admin_get_categories():
 
 
 @categories_bp.route('/api/admin/categories', methods=['POST'])
-@login_required
+@admin_required
 def create_category():
     """Create a new category"""
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     data = request.get_json()
     
     if not data.get('name'):
@@ -68,11 +64,9 @@ def create_category():
 
 
 @categories_bp.route('/api/admin/categories/<int:category_id>', methods=['PUT'])
-@login_required
+@admin_required
 def update_category(category_id):
     """Update a category"""
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     category = Category.query.get_or_404(category_id)
     data = request.get_json()
     
@@ -98,11 +92,9 @@ def update_category(category_id):
 
 
 @categories_bp.route('/api/admin/categories/<int:category_id>', methods=['DELETE'])
-@login_required
+@admin_required
 def delete_category(category_id):
     """Delete a category (soft delete by setting is_active=False)"""
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     category = Category.query.get_or_404(category_id)
     
     # Check if category is used by any menu items
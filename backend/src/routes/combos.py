@@ -2,44 +2,50 @@
 Combo Deal routes
 """
 from flask import Blueprint, jsonify
-from src.models import ComboDeal
+from sqlalchemy.exc import IntegrityError
+from src.extension.db import db
+from src.models import ComboDeal, ComboPricing, RatingSummary
+from src.routes.utils import image_variants
+from src.services.combo_pricing import refresh_combo_pricing
+from src.services.ratings import rating_payload
 
 combos_bp = Blueprint('combos', __name__)
 
 
 @combos_bp.route('/api/combos', methods=['GET'])
 def get_combos():
-    combos = ComboDeal.query.filter_by(is_active=True).all()
+    query = (
+        db.session.query(ComboDeal, ComboPricing, RatingSummary)
+        .outerjoin(ComboPricing, ComboPricing.combo_deal_id == ComboDeal.id)
+        .outerjoin(RatingSummary, RatingSummary.combo_deal_id == ComboDeal.id)
+        .filter(ComboDeal.is_active == True)
+    )
+    rows = query.all()
+
+    # Combos created before the read model existed are materialized on first read
+    missing = [combo.id for combo, pricing, _ in rows if pricing is None]
+    if missing:
+        try:
+            with db.session.begin_nested():
+                refresh_combo_pricing(db.session, missing)
+        except IntegrityError:
+            pass  # A concurrent first read materialized them
+        db.session.commit()
+        rows = query.all()
+
     result = []
-    for combo in combos:
-        # Calculate original total price
-        original_price = sum(item.menu_item.price * item.quantity for item in combo.items)
-        savings = original_price - combo.combo_price
-        
-        # Get category from combo or derive from first item
-        category = combo.category
-        if not category and combo.items:
-            # Get unique categories from items
-            categories = list(set(item.menu_item.category for item in combo.items))
-            category = categories[0] if categories else "Mixed"
-        
+    for combo, pricing, summary in rows:
         result.append({
             'id': combo.id,
             'name': combo.name,
             'description': combo.description,
             'combo_price': combo.combo_price,
-            'original_price': original_price,
-            'savings': savings,
+            'original_price': pricing.original_price,
+            'savings': pricing.savings,
             'image_url': combo.image_url,
-            'category': category or "Mixed",
-            'items': [{
-                'id': item.menu_item.id,
-                'name': item.menu_item.name,
-                'price': item.menu_item.price,
-                'quantity': item.quantity,
-                'image_url': item.menu_item.image_url,
-                'category': item.menu_item.category
-            } for item in combo.items]
+            'image_variants': image_variants(combo.image_url),
+            'category': pricing.category,
+            'items': pricing.items,
+            'rating': rating_payload(summary)
         })
     return jsonify(result)
-
@@ -3,8 +3,7 @@ Coupon routes
 """
 from flask import Blueprint, request, jsonify
 from src.extension.db import db
-from src.models import Coupon
-from datetime import datetime
+from src.services.coupons import coupon_index
 
 coupons_bp = Blueprint('coupons', __name__)
 
@@ -12,9 +11,9 @@ coupons_bp = Blueprint('coupons', __name__)
 @coupons_bp.route('/api/coupons/verify', methods=['POST'])
 def verify_coupon():
     data = request.get_json()
-    code = data.get('code')
-    coupon = Coupon.query.filter_by(code=code).first()
-    if coupon and coupon.valid_until > datetime.utcnow() and coupon.usage_limit > 0:
+    # Answered from the in-process code index; redemption is enforced at checkout
+    coupon = coupon_index.lookup(db.session, data.get('code'))
+    if coupon:
         return jsonify({'discount': coupon.discount_percent, 'valid': True}), 200
     return jsonify({'valid': False, 'message': 'Invalid or expired coupon'}), 400
 
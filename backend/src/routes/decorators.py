@@ -0,0 +1,53 @@
+"""
+Authorization helpers shared by route blueprints
+
+Requests may authenticate with the Flask-Login session cookie or with the
+bearer JWT issued at login. The token carries the user's role and token
+version, so admin checks on the bearer path read no user row. Revocation
+compares the token version with a per-process copy refreshed every
+``TOKEN_VERSION_TTL`` seconds, so steady-state requests need no query.
+"""
+from functools import wraps
+from flask import request, jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from flask_jwt_extended.exceptions import JWTExtendedException
+from flask_login import current_user
+from jwt.exceptions import PyJWTError
+from src.extension.db import login_manager
+
+
+def jwt_claims():
+    """Claims of a valid, unrevoked bearer token on this request, or None"""
+    if not request.headers.get('Authorization', '').startswith('Bearer '):
+        return None
+    try:
+        verify_jwt_in_request()
+    except (JWTExtendedException, PyJWTError):
+        return None
+    return get_jwt()
+
+
+def is_admin_request():
+    """True if the caller is an admin, checking the bearer token before the session"""
+    claims = jwt_claims()
+    if claims is not None:
+        return claims.get('role') == 'admin'
+    return current_user.is_authenticated and current_user.role == 'admin'
+
+
+def admin_required(fn):
+    """Allow only admins; replaces ``@login_required`` plus a role check"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        claims = jwt_claims()
+        if claims is not None:
+            if claims.get('role') != 'admin':
+                return jsonify({'message': 'Unauthorized'}), 403
+            return fn(*args, **kwargs)
+        # No usable token: fall back to the session cookie
+        if not current_user.is_authenticated:
+            return login_manager.unauthorized()
+        if current_user.role != 'admin':
+            return jsonify({'message': 'Unauthorized'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
@@ -1,39 +1,67 @@
 """
 Menu routes
 """
-from flask import Blueprint, request, jsonify
-from flask_login import login_required, current_user
+from flask import Blueprint, request, jsonify, Response
 from src.extension.db import db
-from src.models import MenuItem, Review, ComboDealItem, OrderItem
-from src.routes.utils import save_uploaded_file, UPLOAD_FOLDER
-import os
-
+from src.models import MenuItem, Review, ComboDealItem, OrderItem, RatingSummary
+from src.routes.decorators import admin_required, is_admin_request
+from src.routes.utils import save_uploaded_file, image_variants, image_variants_changed, queue_image_delete
+from src.services.catalog import menu_catalog
+from src.services.combo_pricing import mark_combos_stale
+from src.services.pricing import price_index
+from src.services.ratings import rating_payload
 menu_bp = Blueprint('menu', __name__)
 
 
+def serialize_menu_item(i, summary=None):
+    return {
+        'id': i.id, 'name': i.name, 'description': i.description, 
+        'price': i.price, 'category': i.category, 'image_url': i.image_url, 
+        'image_variants': image_variants(i.image_url),
+        'is_deal': i.is_deal, 'availability': i.availability,
+        'rating': rating_payload(summary)
+    }
+
+
+def menu_items_with_ratings(available_only):
+    """Menu items paired with their rating summaries in a single query"""
+    query = db.session.query(MenuItem, RatingSummary).outerjoin(
+        RatingSummary, RatingSummary.menu_item_id == MenuItem.id
+    )
+    if available_only:
+        query = query.filter(MenuItem.availability == True)
+    return query.all()
+
+
 @menu_bp.route('/api/menu', methods=['GET'])
 def get_menu():
     # Check if admin is requesting all items
-    from flask_login import current_user
     show_all = request.args.get('all', 'false').lower() == 'true'
     
-    if show_all and current_user.is_authenticated and current_user.role == 'admin':
-        items = MenuItem.query.all()
-    else:
-        items = MenuItem.query.filter_by(availability=True).all()
+    if show_all and is_admin_request():
+        rows = menu_items_with_ratings(available_only=False)
+        return jsonify([serialize_menu_item(i, summary) for i, summary in rows])
     
-    return jsonify([{
-        'id': i.id, 'name': i.name, 'description': i.description, 
-        'price': i.price, 'category': i.category, 'image_url': i.image_url, 
-        'is_deal': i.is_deal, 'availability': i.availability
-    } for i in items])
+    # Public menu is served from the in-process snapshot; variants rendered by
+    # another process's job don't invalidate it, so look for them here
+    if image_variants_changed():
+        menu_catalog.invalidate()
+    body, etag, version = menu_catalog.get(
+        lambda: [serialize_menu_item(i, summary) for i, summary in menu_items_with_ratings(available_only=True)]
+    )
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Catalog-Version'] = str(version)
+    return response
 
 
 @menu_bp.route('/api/menu', methods=['POST'])
-@login_required
+@admin_required
 def create_menu_item():
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     
     # Handle file upload
     image_url = None
@@ -81,32 +109,24 @@ def create_menu_item():
     )
     db.session.add(new_item)
     db.session.commit()
+    menu_catalog.invalidate()
+    price_index.invalidate()
     return jsonify({'message': 'Item created', 'id': new_item.id}), 201
 
 
 @menu_bp.route('/api/menu/<int:item_id>', methods=['PUT'])
-@login_required
+@admin_required
 def update_menu_item(item_id):
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     
     item = MenuItem.query.get_or_404(item_id)
     
     # Handle file upload if present
+    old_image_url = item.image_url
     if 'image' in request.files:
         file = request.files['image']
         if file.filename:
             filename = save_uploaded_file(file)
             if filename:
-                # Delete old image if it's a local file
-                if item.image_url and item.image_url.startswith('/api/uploads/'):
-                    old_filename = item.image_url.split('/')[-1]
-                    old_filepath = os.path.join(UPLOAD_FOLDER, old_filename)
-                    if os.path.exists(old_filepath):
-                        try:
-                            os.remove(old_filepath)
-                        except:
-                            pass
                 item.image_url = f'/api/uploads/{filename}'
     
     # Get form data or JSON
@@ -151,39 +171,40 @@ def update_menu_item(item_id):
         if 'availability' in request.form:
             item.availability = request.form.get('availability', 'true').lower() == 'true'
     
+    # Delete the replaced image in the background if no other item still uses it
+    if old_image_url != item.image_url:
+        queue_image_delete(old_image_url)
     db.session.commit()
+    menu_catalog.invalidate()
+    price_index.invalidate()
     return jsonify({'message': 'Item updated'}), 200
 
 
 @menu_bp.route('/api/menu/<int:item_id>', methods=['DELETE'])
-@login_required
+@admin_required
 def delete_menu_item(item_id):
-    if current_user.role != 'admin':
-        return jsonify({'message': 'Unauthorized'}), 403
     item = MenuItem.query.get_or_404(item_id)
     
-    # Delete related reviews
+    # Delete related reviews and their summary
     Review.query.filter_by(menu_item_id=item_id).delete()
+    RatingSummary.query.filter_by(menu_item_id=item_id).delete()
     
     # Delete related combo deal items (this will remove the item from combos)
+    # Bulk deletes bypass the ORM, so mark the affected combos for repricing
+    mark_combos_stale(db.session, [
+        cid for (cid,) in db.session.query(ComboDealItem.combo_deal_id).filter_by(menu_item_id=item_id)
+    ])
     ComboDealItem.query.filter_by(menu_item_id=item_id).delete()
     
     # Note: OrderItems keep the menu_item_id for historical records, but we can set it to None
     # since OrderItems store the name and price at time of order (historical data)
     OrderItem.query.filter_by(menu_item_id=item_id).update({OrderItem.menu_item_id: None})
     
-    # Delete the uploaded image file if it exists
-    if item.image_url and item.image_url.startswith('/api/uploads/'):
-        old_filename = item.image_url.split('/')[-1]
-        old_filepath = os.path.join(UPLOAD_FOLDER, old_filename)
-        if os.path.exists(old_filepath):
-            try:
-                os.remove(old_filepath)
-            except Exception as e:
-                print(f"Error deleting image file: {e}")
-    
-    # Delete the menu item
+    # Delete the menu item; its uploaded image goes in the background if nothing else uses it
+    queue_image_delete(item.image_url)
     db.session.delete(item)
     db.session.commit()
+    menu_catalog.invalidate()
+    price_index.invalidate()
     return jsonify({'message': 'Item deleted successfully'}), 200
 
@@ -3,60 +3,128 @@ Order routes
 """
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
 from src.extension.db import db
 from src.models import Order, OrderItem
+from src.services.coupons import coupon_index, redeem_coupon, CouponExhausted
+from src.services.dashboard import dashboard_stats
+from src.services.order_feed import record_order_event
+from src.services.pricing import price_index
+from src.services.sales_rollup import record_order_sale
 
 orders_bp = Blueprint('orders', __name__)
 
 
+def parse_order_line(item):
+    """Return ``(menu_item_id, combo_deal_id, quantity)`` for a cart line; raises ValueError"""
+    menu_item_id = None
+    combo_deal_id = None
+
+    if isinstance(item.get('id'), int):
+        menu_item_id = item['id']
+    elif isinstance(item.get('id'), str):
+        if item['id'].startswith('combo-'):
+            try:
+                # Extract ID from "combo-1-timestamp"
+                combo_deal_id = int(item['id'].split('-')[1])
+            except (ValueError, IndexError):
+                raise ValueError(f"Invalid item id {item['id']!r}")
+        else:
+            try:
+                menu_item_id = int(item['id'])
+            except ValueError:
+                raise ValueError(f"Invalid item id {item['id']!r}")
+    else:
+        raise ValueError('Item id is required')
+
+    quantity = item.get('quantity')
+    if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+        raise ValueError('Item quantity must be a positive integer')
+    return menu_item_id, combo_deal_id, quantity
+
+
 @orders_bp.route('/api/orders', methods=['POST'])
 @login_required
 def create_order():
-    data = request.get_json()
-    # Expect data: {'items': [{'id': 1, 'quantity': 2}], 'total': 100, 'payment': 'cash', 'type': 'delivery'}
+    data = request.get_json() or {}
+    # Expect data: {'items': [{'id': 1, 'quantity': 2}], 'payment': 'cash', 'type': 'delivery', 'coupon': 'CODE'}
+    # Prices and the total are resolved server-side; client-sent values are not trusted
+    if not data.get('items') or not data.get('payment') or not data.get('type'):
+        return jsonify({'message': 'Missing required fields'}), 400
+    try:
+        lines = [(item, *parse_order_line(item)) for item in data['items']]
+    except (ValueError, AttributeError) as e:
+        return jsonify({'message': str(e)}), 400
+
+    # Resolve every referenced menu item and combo in one round trip
+    menu_prices, combo_prices = price_index.resolve(
+        db.session,
+        {menu_item_id for _, menu_item_id, _, _ in lines if menu_item_id is not None},
+        {combo_deal_id for _, _, combo_deal_id, _ in lines if combo_deal_id is not None},
+    )
+
+    rows = []
+    for item, menu_item_id, combo_deal_id, quantity in lines:
+        if menu_item_id is not None:
+            entry = menu_prices.get(menu_item_id)
+        else:
+            entry = combo_prices.get(combo_deal_id)
+        if entry is None or not entry.available:
+            return jsonify({'message': f"{item.get('name') or 'Item'} is no longer available"}), 400
+        rows.append({
+            'menu_item_id': menu_item_id,
+            'combo_deal_id': combo_deal_id,
+            'name': entry.name,
+            'quantity': quantity,
+            'price': entry.price
+        })
+
+    subtotal = sum(row['price'] * row['quantity'] for row in rows)
+    coupon = None
+    if data.get('coupon'):
+        coupon = coupon_index.lookup(db.session, data['coupon'])
+        if not coupon:
+            return jsonify({'message': 'Invalid or expired coupon'}), 400
+    total = round(subtotal * (100 - coupon.discount_percent) / 100 if coupon else subtotal, 2)
+
     try:
         new_order = Order(
             user_id=current_user.id, 
-            total_amount=data['total'], 
+            total_amount=total, 
             payment_method=data['payment'], 
             order_type=data['type']
         )
         db.session.add(new_order)
-        db.session.commit() # Commit to get ID
+        db.session.flush() # Assigns the order ID without committing
         
-        for item in data['items']:
-            menu_item_id = None
-            combo_deal_id = None
-            
-            if isinstance(item['id'], int):
-                menu_item_id = item['id']
-            elif isinstance(item['id'], str):
-                if item['id'].startswith('combo-'):
-                    try:
-                        # Extract ID from "combo-1-timestamp"
-                        parts = item['id'].split('-')
-                        if len(parts) >= 2:
-                            combo_deal_id = int(parts[1])
-                    except (ValueError, IndexError):
-                        pass
-                else:
-                    try:
-                        menu_item_id = int(item['id'])
-                    except ValueError:
-                        pass
-
-            order_item = OrderItem(
-                order_id=new_order.id, 
-                menu_item_id=menu_item_id,
-                combo_deal_id=combo_deal_id,
-                name=item['name'],
-                quantity=item['quantity'], 
-                price=item['price']
-            )
-            db.session.add(order_item)
+        for row in rows:
+            row['order_id'] = new_order.id
+        # render_nulls keeps menu and combo lines in a single executemany batch
+        db.session.execute(insert(OrderItem).execution_options(render_nulls=True), rows)
+        
+        if coupon:
+            # Atomic against concurrent checkouts; fails the whole order if the coupon ran out
+            redeem_coupon(db.session, coupon, new_order.id, current_user.id, round(subtotal - total, 2))
         
+        record_order_sale(db.session, new_order)
+        record_order_event(db.session, new_order.id, 'created', {
+            'id': new_order.id,
+            'customer': current_user.username,
+            'status': new_order.status,
+            'total': total,
+            'date': new_order.created_at.isoformat(),
+            'type': new_order.order_type,
+            'payment': new_order.payment_method,
+            'items': [{'name': row['name'], 'quantity': row['quantity']} for row in rows],
+        })
+        order_id = new_order.id
         db.session.commit()
-        return jsonify({'message': 'Order placed', 'order_id': new_order.id}), 201
+        dashboard_stats.invalidate()
+        return jsonify({'message': 'Order placed', 'order_id': order_id, 'total': total}), 201
+    except CouponExhausted:
+        db.session.rollback()
+        return jsonify({'message': 'Coupon has been fully redeemed'}), 400
     except Exception as e:
         print(f"Error creating order: {e}")
         db.session.rollback()
@@ -66,7 +134,12 @@ def create_order():
 @orders_bp.route('/api/orders', methods=['GET'])
 @login_required
 def get_orders():
-    orders = Order.query.filter_by(user_id=current_user.id).order_by(Order.created_at.desc()).all()
+    orders = (
+        Order.query.options(selectinload(Order.items))
+        .filter_by(user_id=current_user.id)
+        .order_by(Order.created_at.desc())
+        .all()
+    )
     return jsonify([{
         'id': o.id, 'status': o.status, 'total': o.total_amount, 'date': o.created_at.isoformat(),
         'items': [{
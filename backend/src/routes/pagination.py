@@ -0,0 +1,117 @@
+"""
+Keyset (cursor) pagination helpers for listing endpoints
+"""
+import base64
+import json
+from datetime import datetime
+from flask import Response, current_app, jsonify
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(sort_value, row_id):
+    """Build an opaque cursor token from the last row of a page"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, is_datetime=True):
+    """Decode a cursor token into ``(sort_value, row_id)``; raises ValueError if malformed"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if is_datetime and sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_limit(args):
+    """Read ``limit`` from the query string, clamped to ``MAX_LIMIT``"""
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid limit')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def parse_date_range(args, column):
+    """Build filters for ``from``/``to`` ISO dates or datetimes (both inclusive)"""
+    filters = []
+    for key, op in (('from', column.__ge__), ('to', column.__le__)):
+        value = args.get(key)
+        if not value:
+            continue
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f'Invalid {key} date')
+        if key == 'to' and len(value) == 10:
+            # A bare date means the whole day
+            moment = datetime.combine(moment.date(), datetime.max.time())
+        filters.append(op(moment))
+    return filters
+
+
+def keyset_page(query, args, id_column, sort_column=None):
+    """Return ``(rows, next_cursor)`` for one page, newest first.
+
+    Rows are ordered by ``(sort_column, id_column)`` descending, or by
+    ``id_column`` alone when no sort column is given, and the page starts
+    strictly after the row encoded in the ``cursor`` argument.
+    """
+    limit = parse_limit(args)
+    cursor = args.get('cursor')
+
+    if sort_column is not None:
+        if cursor:
+            sort_value, row_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+            ))
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        if cursor:
+            _, row_id = decode_cursor(cursor, is_datetime=False)
+            query = query.filter(id_column < row_id)
+        query = query.order_by(id_column.desc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        sort_value = getattr(last, sort_column.key) if sort_column is not None else None
+        next_cursor = encode_cursor(sort_value, getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def paginated_response(payload, next_cursor):
+    """JSON array response carrying the next page token in ``X-Next-Cursor``"""
+    response = jsonify(payload)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+
+def streamed_response(rows, serialize, next_cursor):
+    """Stream ``rows`` as a chunked JSON array, one element per chunk"""
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield '['
+        for index, row in enumerate(rows):
+            yield (',' if index else '') + dumps(serialize(row))
+        yield ']'
+
+    response = Response(generate(), mimetype='application/json')
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
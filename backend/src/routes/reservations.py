@@ -1,28 +1,65 @@
 """
 Reservation routes
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_login import login_required, current_user
 from src.extension.db import db
 from src.models import Reservation
+from src.services.reservations import availability, book_seats, check_reservation_time, ReservationFull
 from datetime import datetime
 
 reservations_bp = Blueprint('reservations', __name__)
 
 
+@reservations_bp.route('/api/reservations/availability', methods=['GET'])
+def get_availability():
+    """Seats left per seating time, e.g. ?date=2025-06-13&from=19:00&to=21:00&party_size=4"""
+    try:
+        day = datetime.strptime(request.args['date'], '%Y-%m-%d').date()
+        window_from = datetime.strptime(request.args['from'], '%H:%M').time() if request.args.get('from') else None
+        window_to = datetime.strptime(request.args['to'], '%H:%M').time() if request.args.get('to') else None
+        party_size = int(request.args.get('party_size', 1))
+    except KeyError:
+        return jsonify({'message': 'Missing date'}), 400
+    except ValueError:
+        return jsonify({'message': 'Invalid date, time or party size'}), 400
+    return jsonify({
+        'date': day.isoformat(),
+        'capacity': current_app.config['RESERVATION_CAPACITY'],
+        'duration_minutes': current_app.config['RESERVATION_DURATION_MINUTES'],
+        'slots': availability(db.session, day, window_from, window_to, party_size),
+    })
+
+
 @reservations_bp.route('/api/reservations', methods=['POST'])
 @login_required
 def make_reservation():
-    data = request.get_json()
+    data = request.get_json() or {}
     # Expect date string format needed
-    res_time = datetime.strptime(data['time'], '%Y-%m-%dT%H:%M')
+    try:
+        res_time = datetime.strptime(data['time'], '%Y-%m-%dT%H:%M')
+        party_size = int(data['party_size'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'message': 'Invalid reservation time or party size'}), 400
+    if party_size < 1:
+        return jsonify({'message': 'Invalid reservation time or party size'}), 400
+    try:
+        check_reservation_time(res_time)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
     res = Reservation(
         user_id=current_user.id, 
-        party_size=data['party_size'], 
+        party_size=party_size, 
         reservation_time=res_time,
         special_requests=data.get('requests')
     )
     db.session.add(res)
+    try:
+        # Seat counters and the reservation commit together or not at all
+        book_seats(db.session, res_time, party_size)
+    except ReservationFull:
+        db.session.rollback()
+        return jsonify({'message': 'Not enough seats available at that time'}), 409
     db.session.commit()
     return jsonify({'message': 'Reservation confirmed'}), 201
-
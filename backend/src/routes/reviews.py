@@ -4,48 +4,100 @@ Review routes
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from src.extension.db import db
-from src.models import Review
+from src.models import Review, User, MenuItem, ComboDeal
+from src.routes.pagination import keyset_page, parse_date_range, streamed_response
+from src.services.catalog import menu_catalog
+from src.services.ratings import record_rating
 
 reviews_bp = Blueprint('reviews', __name__)
 
 
+def parse_rating(data):
+    """Return the rating as an int from 1 to 5, or None if invalid"""
+    try:
+        rating = int(data.get('rating'))
+    except (ValueError, TypeError):
+        return None
+    return rating if 1 <= rating <= 5 else None
+
+
 @reviews_bp.route('/api/menu/<int:item_id>/reviews', methods=['POST'])
 @login_required
 def add_review(item_id):
-    data = request.get_json()
-    review = Review(user_id=current_user.id, menu_item_id=item_id, rating=data['rating'], comment=data.get('comment'))
+    data = request.get_json() or {}
+    rating = parse_rating(data)
+    if rating is None:
+        return jsonify({'message': 'Rating must be between 1 and 5'}), 400
+    review = Review(user_id=current_user.id, menu_item_id=item_id, rating=rating, comment=data.get('comment'))
     db.session.add(review)
+    record_rating(db.session, rating, menu_item_id=item_id)
     db.session.commit()
+    # Ratings are embedded in the menu snapshot
+    menu_catalog.invalidate()
     return jsonify({'message': 'Review added'}), 201
 
 
 @reviews_bp.route('/api/combos/<int:combo_id>/reviews', methods=['POST'])
 @login_required
 def add_combo_review(combo_id):
-    data = request.get_json()
-    review = Review(user_id=current_user.id, combo_deal_id=combo_id, rating=data['rating'], comment=data.get('comment'))
+    data = request.get_json() or {}
+    rating = parse_rating(data)
+    if rating is None:
+        return jsonify({'message': 'Rating must be between 1 and 5'}), 400
+    review = Review(user_id=current_user.id, combo_deal_id=combo_id, rating=rating, comment=data.get('comment'))
     db.session.add(review)
+    record_rating(db.session, rating, combo_deal_id=combo_id)
     db.session.commit()
     return jsonify({'message': 'Review added'}), 201
 
 
+def review_listing_query():
+    """Projection of the review columns listings need, with the author joined in"""
+    return (
+        db.session.query(
+            Review.id, Review.rating, Review.comment, Review.created_at, User.username
+        )
+        .join(User, User.id == Review.user_id)
+    )
+
+
 @reviews_bp.route('/api/menu/<int:item_id>/reviews', methods=['GET'])
 def get_reviews(item_id):
-    reviews = Review.query.filter_by(menu_item_id=item_id).all()
-    return jsonify([{
-        'user': r.author.username, 'rating': r.rating, 'comment': r.comment, 'date': r.created_at.isoformat()
-    } for r in reviews])
+    try:
+        query = review_listing_query().filter(Review.menu_item_id == item_id)
+        query = query.filter(*parse_date_range(request.args, Review.created_at))
+        rows, next_cursor = keyset_page(query, request.args, Review.id, sort_column=Review.created_at)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return streamed_response(rows, lambda r: {
+        'user': r.username, 'rating': r.rating, 'comment': r.comment, 'date': r.created_at.isoformat()
+    }, next_cursor)
 
 
 @reviews_bp.route('/api/reviews', methods=['GET'])
 def get_all_reviews():
-    reviews = Review.query.order_by(Review.created_at.desc()).all()
-    return jsonify([{
+    query = (
+        review_listing_query()
+        .add_columns(MenuItem.name.label('item_name'), ComboDeal.name.label('combo_name'))
+        .outerjoin(MenuItem, MenuItem.id == Review.menu_item_id)
+        .outerjoin(ComboDeal, ComboDeal.id == Review.combo_deal_id)
+    )
+    try:
+        # Optional filters: item_id, combo_id, rating, from, to
+        for arg, column in (('item_id', Review.menu_item_id), ('combo_id', Review.combo_deal_id), ('rating', Review.rating)):
+            if request.args.get(arg):
+                if not request.args[arg].isdigit():
+                    raise ValueError(f'Invalid {arg}')
+                query = query.filter(column == int(request.args[arg]))
+        query = query.filter(*parse_date_range(request.args, Review.created_at))
+        rows, next_cursor = keyset_page(query, request.args, Review.id, sort_column=Review.created_at)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return streamed_response(rows, lambda r: {
         'id': r.id,
-        'user': r.author.username,
-        'item_name': r.item.name if r.item else (r.combo.name if r.combo else "Unknown"),
+        'user': r.username,
+        'item_name': r.item_name or r.combo_name or "Unknown",
         'rating': r.rating,
         'comment': r.comment,
         'date': r.created_at.isoformat()
-    } for r in reviews])
-
+    }, next_cursor)
@@ -1,14 +1,60 @@
 """
 File upload routes
 """
-from flask import Blueprint, send_from_directory
+import mimetypes
+import os
+from flask import Blueprint, Response, abort, current_app, request, send_from_directory
+from werkzeug.security import safe_join
 from src.routes.utils import UPLOAD_FOLDER
+from src.services.images import is_content_addressed
+from src.services.upload_stats import upload_stats
 
 uploads_bp = Blueprint('uploads', __name__)
 
+IMMUTABLE_MAX_AGE = 31536000  # One year; content-hash names never change content
+
+
+def offloaded_response(filename, path, etag):
+    """Empty response telling the front proxy to stream the file itself"""
+    response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+    if current_app.config['UPLOAD_OFFLOAD'] == 'x-accel':
+        response.headers['X-Accel-Redirect'] = current_app.config['UPLOAD_ACCEL_PREFIX'] + filename
+    else:
+        response.headers['X-Sendfile'] = path
+    if etag:
+        response.set_etag(etag)
+        if etag in request.if_none_match:
+            response.status_code = 304
+            response.headers.pop('X-Accel-Redirect', None)
+            response.headers.pop('X-Sendfile', None)
+    return response
+
 
 @uploads_bp.route('/api/uploads/<filename>')
 def uploaded_file(filename):
     """Serve uploaded images"""
-    return send_from_directory(UPLOAD_FOLDER, filename)
+    path = safe_join(UPLOAD_FOLDER, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    # Content-addressed files get a strong ETag from their name and are cached forever
+    immutable = is_content_addressed(filename)
+    etag = filename if immutable else None
+
+    offloaded = bool(current_app.config['UPLOAD_OFFLOAD'])
+    if offloaded:
+        response = offloaded_response(filename, path, etag)
+        nbytes = os.path.getsize(path)
+    else:
+        # send_file answers If-None-Match/If-Modified-Since and Range requests itself
+        response = send_from_directory(UPLOAD_FOLDER, filename, etag=etag or True)
+        nbytes = response.content_length or 0
 
+    if immutable:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    response.headers['Accept-Ranges'] = 'bytes'
+    upload_stats.record(response.status_code, nbytes, offloaded)
+    return response
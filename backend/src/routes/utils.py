@@ -2,8 +2,10 @@
 Utility functions for routes
 """
 import os
-from datetime import datetime
-from werkzeug.utils import secure_filename
+from src.extension.db import db
+from src.models import MenuItem, ComboDeal
+from src.services.images import image_pipeline, UPLOAD_URL_PREFIX
+from src.services.jobs import job_queue
 
 # Configuration for file uploads
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
@@ -16,14 +18,68 @@ def allowed_file(filename):
 
 
 def save_uploaded_file(file):
-    """Save uploaded file and return the filename"""
+    """Save uploaded file under its content hash and return the filename.
+
+    Variants are rendered by a background job queued in the current
+    transaction, so they only start once the caller commits.
+    """
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        # Add timestamp to make filename unique
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
+        ext = file.filename.rsplit('.', 1)[1].lower()
+        if ext == 'jpeg':
+            ext = 'jpg'
+        filename = image_pipeline.store(file.read(), ext, UPLOAD_FOLDER)
+        if image_pipeline.needs_variants(filename, UPLOAD_FOLDER):
+            job_queue.enqueue(
+                db.session, 'render_image_variants', {'filename': filename},
+                key=f"render_image_variants:{filename.rsplit('.', 1)[0]}",
+            )
         return filename
     return None
 
+
+def image_variants(image_url):
+    """Resized/WebP variant map for an uploaded image, or None"""
+    return image_pipeline.variants(image_url, UPLOAD_FOLDER)
+
+
+def image_variants_changed():
+    """True when variants rendered elsewhere became available since they were last looked up"""
+    return image_pipeline.manifests_appeared(UPLOAD_FOLDER)
+
+
+def queue_image_delete(image_url):
+    """Queue ``delete_uploaded_image`` in the current transaction"""
+    if image_url and image_url.startswith(UPLOAD_URL_PREFIX):
+        job_queue.enqueue(db.session, 'delete_upload', {'image_url': image_url}, key=f'delete_upload:{image_url}')
+
+
+def delete_uploaded_image(image_url):
+    """Delete an uploaded image and its variants once nothing references it.
+
+    Uploads are deduplicated by content, so call this after committing the
+    change that dropped ``image_url`` (or use ``queue_image_delete``).
+    """
+    if not image_url or not image_url.startswith(UPLOAD_URL_PREFIX):
+        return
+    in_use = db.session.query(
+        MenuItem.query.filter_by(image_url=image_url).exists()
+        | ComboDeal.query.filter_by(image_url=image_url).exists()
+    ).scalar()
+    if in_use:
+        return
+    try:
+        image_pipeline.delete(image_url[len(UPLOAD_URL_PREFIX):], UPLOAD_FOLDER)
+    except OSError as e:
+        print(f"Error deleting image file: {e}")
+
+
+@job_queue.task('render_image_variants')
+def _render_image_variants(payload):
+    filename = payload['filename']
+    if image_pipeline.needs_variants(filename, UPLOAD_FOLDER) and os.path.exists(os.path.join(UPLOAD_FOLDER, filename)):
+        image_pipeline.render_variants(UPLOAD_FOLDER, filename)
+
+
+@job_queue.task('delete_upload')
+def _delete_upload(payload):
+    delete_uploaded_image(payload['image_url'])
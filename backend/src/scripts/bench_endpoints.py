@@ -0,0 +1,212 @@
+"""
+Benchmark every blueprint through the Flask test client against synthetic data.
+Run with: python -m src.scripts.bench_endpoints [--scale small|medium|large] [--iterations N] [--seed N]
+          [--save] [--compare] [--baseline PATH] [--tolerance FRACTION]
+
+Builds a throwaway SQLite database with generate_data at the chosen scale,
+then times each endpoint case and reports p50/p95/p99 latency, SQL
+statements per request and peak Python memory (tracemalloc, measured in a
+separate pass so it does not skew the timings). --save writes the results
+to benchmarks/<scale>.json so baselines are committed and diffable;
+--compare checks a run against that file and exits non-zero when median
+latency grows past the tolerance or an endpoint issues more queries
+(p95/p99 are shown too but are too noisy at these sample sizes to gate on).
+"""
+import gc
+import hashlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+import sqlalchemy
+from sqlalchemy import event
+from src import create_app
+from src.extension.db import db
+from src.routes.utils import UPLOAD_FOLDER
+from src.services.images import DIGEST_LENGTH
+from src.scripts.generate_data import START, generate_data
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "benchmarks")
+SCALES = {
+    "small": dict(users=500, items=100, combos=30, orders=20000, reviews=5000, reservations=2000),
+    "medium": dict(users=5000, items=300, combos=80, orders=200000, reviews=50000, reservations=20000),
+    "large": dict(users=50000, items=500, combos=150, orders=2000000, reviews=500000, reservations=200000),
+}
+# Timings below this many milliseconds are treated as noise when comparing
+NOISE_FLOOR_MS = 1.0
+# Served by the uploads case; named by content hash like a stored original
+UPLOAD_BODY = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 64
+
+
+def endpoint_cases(ids):
+    """``(name, role, method, path, json)`` for one representative request per endpoint"""
+    day = (START + timedelta(days=30)).strftime("%Y-%m-%d")
+    order = {"items": [{"id": ids["item"], "quantity": 2}], "payment": "card", "type": "pickup"}
+    return [
+        ("auth.login", None, "POST", "/api/auth/login", {"email": "user2@example.com", "password": "password"}),
+        ("auth.get_user", "customer", "GET", "/api/auth/user", None),
+        ("menu.get_menu", None, "GET", "/api/menu", None),
+        ("menu.get_menu (admin)", "admin", "GET", "/api/menu", None),
+        ("categories.get_categories", None, "GET", "/api/categories", None),
+        ("categories.admin_get_categories", "admin", "GET", "/api/admin/categories", None),
+        ("combos.get_combos", None, "GET", "/api/combos", None),
+        ("reviews.get_reviews", None, "GET", f"/api/menu/{ids['item']}/reviews", None),
+        ("reviews.get_all_reviews", None, "GET", "/api/reviews", None),
+        ("coupons.verify_coupon", "customer", "POST", "/api/coupons/verify", {"code": "SYNTH0"}),
+        ("orders.get_orders", "customer", "GET", "/api/orders", None),
+        ("orders.create_order", "customer", "POST", "/api/orders", order),
+        ("reservations.get_availability", None, "GET", f"/api/reservations/availability?date={day}&party_size=2", None),
+        ("admin.admin_get_orders", "admin", "GET", "/api/admin/orders", None),
+        ("admin.admin_get_orders (status)", "admin", "GET", "/api/admin/orders?status=pending", None),
+        ("admin.admin_get_reservations", "admin", "GET", "/api/admin/reservations", None),
+        ("admin.get_all_users", "admin", "GET", "/api/admin/users", None),
+        ("admin.get_sales_analytics", "admin", "GET", "/api/admin/analytics/sales?period=month", None),
+        ("admin.get_dashboard_stats", "admin", "GET", "/api/admin/analytics/stats", None),
+        ("admin.get_job_stats", "admin", "GET", "/api/admin/jobs", None),
+        ("admin.get_metrics", "admin", "GET", "/metrics", None),
+        ("uploads.uploaded_file", None, "GET", f"/api/uploads/{ids['upload']}", None),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def bench_endpoints(scale="small", iterations=50, seed=42):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "BCRYPT_LOG_ROUNDS": 4,
+        "JOB_INLINE_WORKERS": 0,
+        "QUERY_AUDIT": False,
+    })
+    with app.app_context():
+        counts = generate_data(seed=seed, log=lambda message: print(f"  {message}"), **SCALES[scale])
+        ids = {"item": db.session.scalar(sqlalchemy.text("SELECT min(id) FROM menu_item WHERE availability = 1"))}
+        statements = [0]
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def count_statement(*args):
+            statements[0] += 1
+
+    ids["upload"] = hashlib.sha256(UPLOAD_BODY).hexdigest()[:DIGEST_LENGTH] + ".jpg"
+    upload_path = os.path.join(UPLOAD_FOLDER, ids["upload"])
+    created_upload = not os.path.exists(upload_path)
+    if created_upload:
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        with open(upload_path, "wb") as f:
+            f.write(UPLOAD_BODY)
+
+    # No cookie jar: login sets a session cookie that would otherwise ride along
+    # on every later request, so cases would measure the session path instead
+    # of the bearer token (or anonymous access) they claim to
+    client = app.test_client(use_cookies=False)
+    headers = {None: {}}
+    for role, email in (("admin", "user1@example.com"), ("customer", "user2@example.com")):
+        token = client.post("/api/auth/login", json={"email": email, "password": "password"}).get_json()["token"]
+        headers[role] = {"Authorization": f"Bearer {token}"}
+
+    results = {}
+    for name, role, method, url, body in endpoint_cases(ids):
+        def call():
+            return client.open(url, method=method, json=body, headers=headers[role])
+
+        for _ in range(3):
+            call()  # Warm caches and connections
+        gc.collect()  # Don't bill one case for garbage left by the previous one
+        timings, queries, status = [], [], None
+        for _ in range(iterations):
+            before = statements[0]
+            started = time.perf_counter()
+            response = call()
+            response.get_data()
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(statements[0] - before)
+            status = response.status_code
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        call().get_data()
+        peak = tracemalloc.get_traced_memory()[1] - baseline_memory
+        tracemalloc.stop()
+
+        timings.sort()
+        queries.sort()
+        results[name] = {
+            "status": status,
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "p99_ms": round(percentile(timings, 0.99), 3),
+            "queries": percentile(queries, 0.50),
+            "peak_kib": round(peak / 1024, 1),
+        }
+        print(f"{name:40} {status}  p50 {results[name]['p50_ms']:8.2f}ms  p95 {results[name]['p95_ms']:8.2f}ms  "
+              f"p99 {results[name]['p99_ms']:8.2f}ms  {results[name]['queries']:3} queries  {results[name]['peak_kib']:9.1f} KiB")
+
+    with app.app_context():
+        db.engine.dispose()
+    if created_upload:
+        os.remove(upload_path)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return {
+        "meta": {
+            "scale": scale,
+            "data": counts,
+            "iterations": iterations,
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+        },
+        "endpoints": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.5):
+    """Print a side-by-side diff and return the names of regressed endpoints"""
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            print(f"{name:40} new")
+            continue
+        slower = now["p50_ms"] > before["p50_ms"] * (1 + tolerance) and now["p50_ms"] - before["p50_ms"] > NOISE_FLOOR_MS
+        more_queries = now["queries"] > before["queries"]
+        flag = "REGRESSED" if slower or more_queries else ""
+        print(f"{name:40} p50 {before['p50_ms']:8.2f} -> {now['p50_ms']:8.2f}ms  "
+              f"p95 {before['p95_ms']:8.2f} -> {now['p95_ms']:8.2f}ms  "
+              f"queries {before['queries']:3} -> {now['queries']:3}  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    scale = args[args.index('--scale') + 1] if '--scale' in args else 'small'
+    baseline_path = args[args.index('--baseline') + 1] if '--baseline' in args else os.path.join(BASELINE_DIR, f"{scale}.json")
+    report = bench_endpoints(
+        scale=scale,
+        iterations=int(args[args.index('--iterations') + 1]) if '--iterations' in args else 50,
+        seed=int(args[args.index('--seed') + 1]) if '--seed' in args else 42,
+    )
+    ok = True
+    if '--compare' in args:
+        with open(baseline_path, encoding='utf-8') as f:
+            regressed = compare(report, json.load(f), float(args[args.index('--tolerance') + 1]) if '--tolerance' in args else 0.5)
+        print(f"{len(regressed)} regressed endpoint(s)" if regressed else "No regressions")
+        ok = not regressed
+    if '--save' in args:
+        os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {baseline_path}")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,90 @@
+"""
+Benchmark concurrent order writers against SQLite with and without the production profile.
+Run with: python -m src.scripts.bench_sqlite_writers [--writers N] [--orders N]
+
+Each writer thread places orders the way create_order does (order row,
+order lines and the daily sales rollup in one transaction) against a
+throwaway database file, once in rollback-journal mode and once with the
+WAL profile. Reports throughput and "database is locked" failures.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+from src import create_app
+from src.extension.db import db
+from src.models import Order, OrderItem, User
+from src.services.sales_rollup import record_order_sale
+
+LEGACY_PROFILE = {
+    "SQLITE_JOURNAL_MODE": "DELETE",
+    "SQLITE_BUSY_TIMEOUT": None,
+    "SQLITE_SYNCHRONOUS": "FULL",
+    "SQLITE_CACHE_SIZE": None,
+    "SQLITE_MMAP_SIZE": None,
+}
+
+
+def run_profile(name, overrides, writers, orders):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    config = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"}
+    config.update(overrides)
+    app = create_app(config)
+    with app.app_context():
+        user = User(username="bench", email="bench@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    failures = []
+
+    def writer():
+        with app.app_context():
+            for _ in range(orders):
+                try:
+                    order = Order(user_id=user_id, total_amount=12.5, payment_method="card", order_type="pickup")
+                    db.session.add(order)
+                    db.session.flush()
+                    db.session.add_all(
+                        OrderItem(order_id=order.id, name="Bench item", quantity=1, price=6.25) for _ in range(2)
+                    )
+                    record_order_sale(db.session, order)
+                    db.session.commit()
+                except OperationalError:
+                    db.session.rollback()
+                    failures.append(1)
+            db.session.remove()
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        committed = Order.query.count()
+        db.engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    print(f"{name:<10} {committed:>6} orders in {elapsed:6.2f}s  "
+          f"{committed / elapsed:8.1f} orders/s  {len(failures):>5} locked")
+
+
+def bench_sqlite_writers(writers=8, orders=200):
+    print(f"{writers} writers x {orders} orders")
+    run_profile("legacy", LEGACY_PROFILE, writers, orders)
+    run_profile("wal", {}, writers, orders)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    bench_sqlite_writers(
+        writers=int(args[args.index('--writers') + 1]) if '--writers' in args else 8,
+        orders=int(args[args.index('--orders') + 1]) if '--orders' in args else 200,
+    )
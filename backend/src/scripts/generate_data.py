@@ -0,0 +1,254 @@
+"""
+Generate a deterministic synthetic dataset at production-like volume.
+Run with: python -m src.scripts.generate_data [--users N] [--items N] [--combos N] [--orders N]
+          [--reviews N] [--reservations N] [--coupons N] [--seed N] [--database URI]
+
+The same counts and seed always produce the same rows, so benchmark runs
+against the data are comparable between commits. Rows are written with
+chunked bulk inserts (orders up to millions) and the read models (combo
+pricing, rating summaries, daily sales, reservation slots) are rebuilt at
+the end. Meant for an empty database; the first generated user is an admin
+and every user's password is "password".
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+from src.extension.db import db
+from src.extension.hashing import password_hasher
+from src.models import (
+    Category, ComboDeal, ComboDealItem, Coupon, MenuItem, Order, OrderItem, Reservation, Review, User,
+)
+from src.services.catalog import menu_catalog
+from src.services.combo_pricing import refresh_combo_pricing
+from src.services.pricing import price_index
+from src.services.ratings import rebuild_rating_summaries
+from src.services.reservations import rebuild_reservation_slots
+from src.services.sales_rollup import rebuild_daily_sales
+
+CATEGORIES = ["Burgers", "Pizza", "Pasta", "Salads", "Wraps", "Sides", "Desserts", "Drinks"]
+ADJECTIVES = ["Classic", "Spicy", "Smoky", "Crispy", "Garden", "Double", "Truffle", "Honey", "Loaded", "Zesty"]
+# Statuses weighted towards finished orders, like a real history
+ORDER_STATUSES = (
+    ["delivered"] * 45 + ["picked_up"] * 35 + ["cancelled"] * 5 + ["denied"] * 3
+    + ["pending", "accepted", "preparing", "ready", "on_the_way"] * 2 + ["ready"] * 2
+)
+RATINGS = [1, 2, 3, 3, 4, 4, 4, 5, 5, 5]
+START = datetime(2025, 1, 1)  # Fixed so the data does not depend on when it is generated
+DAYS = 365
+CHUNK = 5000
+
+
+def _next_id(model):
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _bulk(model, rows):
+    if rows:
+        db.session.execute(insert(model), rows)
+
+
+def generate_users(rng, count):
+    password_hash = password_hasher.hash("password")
+    first = _next_id(User)
+    rows = []
+    for i in range(first, first + count):
+        rows.append({
+            "id": i,
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "password_hash": password_hash,
+            "address": f"{rng.randint(1, 999)} Synthetic Street",
+            "role": "admin" if i == first else "customer",
+            "token_version": 0,
+        })
+        if len(rows) == CHUNK:
+            _bulk(User, rows)
+            rows = []
+    _bulk(User, rows)
+    return list(range(first, first + count))
+
+
+def generate_menu(rng, item_count, combo_count):
+    existing = set(db.session.scalars(select(Category.name)))
+    _bulk(Category, [
+        {"name": name, "description": f"{name} (synthetic)", "is_active": True, "created_at": START}
+        for name in CATEGORIES if name not in existing
+    ])
+    first = _next_id(MenuItem)
+    items = []
+    for i in range(first, first + item_count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        items.append({
+            "id": i,
+            "name": f"{rng.choice(ADJECTIVES)} {category.rstrip('s')} {i}",
+            "description": f"Synthetic {category.lower()} item number {i}.",
+            "price": round(rng.uniform(2.5, 25.0), 2),
+            "category": category,
+            "image_url": None,
+            "is_deal": rng.random() < 0.1,
+            "availability": rng.random() < 0.95,
+        })
+    _bulk(MenuItem, items)
+
+    first_combo = _next_id(ComboDeal)
+    combos, lines = [], []
+    for i in range(first_combo, first_combo + combo_count):
+        picked = rng.sample(items, min(len(items), rng.randint(2, 4)))
+        full_price = 0.0
+        for item in picked:
+            quantity = rng.randint(1, 2)
+            full_price += item["price"] * quantity
+            lines.append({"combo_deal_id": i, "menu_item_id": item["id"], "quantity": quantity})
+        combos.append({
+            "id": i,
+            "name": f"Combo {i}",
+            "description": "Synthetic combo deal.",
+            "combo_price": round(full_price * 0.85, 2),
+            "image_url": None,
+            "category": picked[0]["category"],
+            "is_active": rng.random() < 0.9,
+        })
+    _bulk(ComboDeal, combos)
+    _bulk(ComboDealItem, lines)
+    return items, combos
+
+
+def generate_orders(rng, count, user_ids, items, combos):
+    order_id = _next_id(Order)
+    orders, lines = [], []
+    for _ in range(count):
+        total = 0.0
+        for _ in range(rng.randint(1, 4)):
+            if combos and rng.random() < 0.15:
+                combo = rng.choice(combos)
+                line = {"menu_item_id": None, "combo_deal_id": combo["id"], "name": combo["name"], "price": combo["combo_price"]}
+            else:
+                item = rng.choice(items)
+                line = {"menu_item_id": item["id"], "combo_deal_id": None, "name": item["name"], "price": item["price"]}
+            line.update(order_id=order_id, quantity=rng.randint(1, 3))
+            total += line["price"] * line["quantity"]
+            lines.append(line)
+        order_type = "delivery" if rng.random() < 0.55 else "pickup"
+        status = rng.choice(ORDER_STATUSES)
+        if order_type == "pickup" and status in ("delivered", "on_the_way"):
+            status = "picked_up"
+        elif order_type == "delivery" and status == "picked_up":
+            status = "delivered"
+        orders.append({
+            "id": order_id,
+            "user_id": rng.choice(user_ids),
+            "status": status,
+            "total_amount": round(total, 2),
+            "payment_method": "card" if rng.random() < 0.6 else "cash",
+            "order_type": order_type,
+            "created_at": START + timedelta(seconds=rng.randrange(DAYS * 86400)),
+        })
+        order_id += 1
+        if len(orders) == CHUNK:
+            _bulk(Order, orders)
+            _bulk(OrderItem, lines)
+            db.session.commit()
+            orders, lines = [], []
+    _bulk(Order, orders)
+    _bulk(OrderItem, lines)
+    db.session.commit()
+
+
+def generate_reviews(rng, count, user_ids, items, combos):
+    rows = []
+    for _ in range(count):
+        on_combo = combos and rng.random() < 0.2
+        rows.append({
+            "user_id": rng.choice(user_ids),
+            "menu_item_id": None if on_combo else rng.choice(items)["id"],
+            "combo_deal_id": rng.choice(combos)["id"] if on_combo else None,
+            "rating": rng.choice(RATINGS),
+            "comment": rng.choice([None, "Great!", "Would order again.", "A bit cold.", "Too salty."]),
+            "created_at": START + timedelta(seconds=rng.randrange(DAYS * 86400)),
+        })
+        if len(rows) == CHUNK:
+            _bulk(Review, rows)
+            rows = []
+    _bulk(Review, rows)
+
+
+def generate_reservations(rng, count, user_ids):
+    rows = []
+    for _ in range(count):
+        day = START + timedelta(days=rng.randrange(DAYS))
+        # Slot-aligned seatings between 11:00 and 21:30 so they fit the default opening hours
+        start = day.replace(hour=11) + timedelta(minutes=15 * rng.randrange(43))
+        rows.append({
+            "user_id": rng.choice(user_ids),
+            "party_size": rng.choice([2, 2, 2, 3, 4, 4, 5, 6, 8]),
+            "reservation_time": start,
+            "status": "cancelled" if rng.random() < 0.1 else "confirmed",
+            "special_requests": rng.choice([None, None, "Window seat", "Birthday"]),
+        })
+        if len(rows) == CHUNK:
+            _bulk(Reservation, rows)
+            rows = []
+    _bulk(Reservation, rows)
+
+
+def generate_coupons(rng, count):
+    existing = set(db.session.scalars(select(Coupon.code)))
+    _bulk(Coupon, [
+        {
+            "code": f"SYNTH{i}",
+            "discount_percent": rng.choice([5, 10, 15, 20]),
+            "valid_until": datetime(2099, 1, 1),
+            "usage_limit": rng.choice([100, 1000, 100000]),
+        }
+        for i in range(count) if f"SYNTH{i}" not in existing
+    ])
+
+
+def generate_data(users=1000, items=200, combos=50, orders=50000, reviews=20000, reservations=5000,
+                  coupons=5, seed=42, log=print):
+    """Insert the requested volume into the current app's database; returns the counts"""
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    user_ids = generate_users(rng, max(users, 1))
+    menu_items, combo_deals = generate_menu(rng, max(items, 1), combos)
+    generate_coupons(rng, coupons)
+    db.session.commit()
+    log(f"Users, menu and coupons done in {time.perf_counter() - started:.1f}s")
+    generate_orders(rng, orders, user_ids, menu_items, combo_deals)
+    log(f"{orders} orders done in {time.perf_counter() - started:.1f}s")
+    generate_reviews(rng, reviews, user_ids, menu_items, combo_deals)
+    generate_reservations(rng, reservations, user_ids)
+    db.session.commit()
+
+    refresh_combo_pricing(db.session, [c["id"] for c in combo_deals])
+    rebuild_rating_summaries(db.session)
+    rebuild_daily_sales(db.session)
+    rebuild_reservation_slots(db.session)
+    db.session.commit()
+    menu_catalog.invalidate()
+    price_index.invalidate()
+    log(f"Read models rebuilt; finished in {time.perf_counter() - started:.1f}s")
+    return {
+        "users": len(user_ids), "items": len(menu_items), "combos": len(combo_deals), "orders": orders,
+        "reviews": reviews, "reservations": reservations, "coupons": coupons, "seed": seed,
+    }
+
+if __name__ == '__main__':
+    from src import create_app
+
+    args = sys.argv[1:]
+
+    def arg(name, default):
+        return int(args[args.index(name) + 1]) if name in args else default
+
+    config = {"SQLALCHEMY_DATABASE_URI": args[args.index('--database') + 1]} if '--database' in args else None
+    app = create_app(config)
+    with app.app_context():
+        counts = generate_data(
+            users=arg('--users', 1000), items=arg('--items', 200), combos=arg('--combos', 50),
+            orders=arg('--orders', 50000), reviews=arg('--reviews', 20000),
+            reservations=arg('--reservations', 5000), coupons=arg('--coupons', 5), seed=arg('--seed', 42),
+        )
+        print(f"Generated {counts}")
@@ -0,0 +1,39 @@
+"""
+Apply pending schema migrations (replaces the old fix_db.py).
+Run with: python -m src.scripts.migrate [--status] [--explain]
+
+--status   list applied and pending migrations without applying anything
+--explain  print EXPLAIN plans for the hot queries before and after migrating
+"""
+import sys
+from src import create_app
+from src.extension.db import db
+from src.migrations import MIGRATIONS
+from src.migrations.explain import explain_hot_queries, print_report
+from src.migrations.runner import applied_versions, migrate
+
+app = create_app()
+
+def run_migrations(args):
+    with app.app_context():
+        if "--status" in args:
+            applied = applied_versions(db.engine)
+            for migration in MIGRATIONS:
+                state = "applied" if migration.VERSION in applied else "pending"
+                print(f"{migration.VERSION:04d} [{state}] {migration.DESCRIPTION}")
+            return
+
+        if "--explain" in args:
+            with db.engine.connect() as conn:
+                print_report("Before", explain_hot_queries(conn))
+
+        applied = migrate(db.engine)
+        if not applied:
+            print("Database is up to date.")
+
+        if "--explain" in args:
+            with db.engine.connect() as conn:
+                print_report("After", explain_hot_queries(conn))
+
+if __name__ == '__main__':
+    run_migrations(sys.argv[1:])
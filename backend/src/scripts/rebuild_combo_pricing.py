@@ -0,0 +1,21 @@
+"""
+Rebuild the materialized combo pricing read model from scratch.
+Run with: python -m src.scripts.rebuild_combo_pricing
+"""
+from src import create_app
+from src.extension.db import db
+from src.models import ComboDeal, ComboPricing
+from src.services.combo_pricing import refresh_combo_pricing
+
+app = create_app()
+
+def rebuild_combo_pricing():
+    with app.app_context():
+        ComboPricing.query.delete()
+        combo_ids = [cid for (cid,) in db.session.query(ComboDeal.id)]
+        refresh_combo_pricing(db.session, combo_ids)
+        db.session.commit()
+        print(f"Rebuilt pricing for {len(combo_ids)} combo deals.")
+
+if __name__ == '__main__':
+    rebuild_combo_pricing()
@@ -0,0 +1,18 @@
+"""
+Backfill the daily_sales rollup from existing orders.
+Run with: python -m src.scripts.rebuild_daily_sales
+"""
+from src import create_app
+from src.extension.db import db
+from src.services.sales_rollup import rebuild_daily_sales
+
+app = create_app()
+
+def backfill_daily_sales():
+    with app.app_context():
+        days = rebuild_daily_sales(db.session)
+        db.session.commit()
+        print(f"Rebuilt daily sales rollup for {days} days.")
+
+if __name__ == '__main__':
+    backfill_daily_sales()
@@ -0,0 +1,44 @@
+"""
+Move legacy uploads to content-hash names and render their image variants.
+Run with: python -m src.scripts.rebuild_image_variants
+"""
+import os
+from src import create_app
+from src.extension.db import db
+from src.models import MenuItem, ComboDeal
+from src.routes.utils import UPLOAD_FOLDER, delete_uploaded_image
+from src.services.catalog import menu_catalog
+from src.services.images import image_pipeline, UPLOAD_URL_PREFIX
+
+app = create_app()
+
+def rebuild_image_variants():
+    with app.app_context():
+        urls = {
+            url for (url,) in db.session.query(MenuItem.image_url).union(db.session.query(ComboDeal.image_url))
+            if url and url.startswith(UPLOAD_URL_PREFIX)
+        }
+        rendered = 0
+        for url in sorted(urls):
+            filename = url[len(UPLOAD_URL_PREFIX):]
+            path = os.path.join(UPLOAD_FOLDER, filename)
+            if not os.path.exists(path):
+                print(f"Missing upload: {filename}")
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            ext = filename.rsplit('.', 1)[-1].lower().replace('jpeg', 'jpg')
+            new_filename = image_pipeline.store(data, ext, UPLOAD_FOLDER)
+            if new_filename != filename:
+                new_url = UPLOAD_URL_PREFIX + new_filename
+                MenuItem.query.filter_by(image_url=url).update({MenuItem.image_url: new_url})
+                ComboDeal.query.filter_by(image_url=url).update({ComboDeal.image_url: new_url})
+                db.session.commit()
+                delete_uploaded_image(url)
+            image_pipeline.render_variants(UPLOAD_FOLDER, new_filename)
+            rendered += 1
+        menu_catalog.invalidate()
+        print(f"Rendered variants for {rendered} uploaded images.")
+
+if __name__ == '__main__':
+    rebuild_image_variants()
@@ -0,0 +1,20 @@
+"""
+Rebuild rating summaries from existing reviews.
+Run with: python -m src.scripts.rebuild_ratings
+"""
+from src import create_app
+from src.extension.db import db
+from src.services.catalog import menu_catalog
+from src.services.ratings import rebuild_rating_summaries
+
+app = create_app()
+
+def rebuild_ratings():
+    with app.app_context():
+        count = rebuild_rating_summaries(db.session)
+        db.session.commit()
+        menu_catalog.invalidate()
+        print(f"Rebuilt {count} rating summaries.")
+
+if __name__ == '__main__':
+    rebuild_ratings()
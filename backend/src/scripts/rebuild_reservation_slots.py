@@ -0,0 +1,18 @@
+"""
+Rebuild reservation seat counters from confirmed reservations.
+Run with: python -m src.scripts.rebuild_reservation_slots
+"""
+from src import create_app
+from src.extension.db import db
+from src.services.reservations import rebuild_reservation_slots
+
+app = create_app()
+
+def rebuild_slots():
+    with app.app_context():
+        count = rebuild_reservation_slots(db.session)
+        db.session.commit()
+        print(f"Rebuilt {count} reservation slots.")
+
+if __name__ == '__main__':
+    rebuild_slots()
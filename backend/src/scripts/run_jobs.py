@@ -0,0 +1,45 @@
+"""
+Run background job workers, or inspect and tidy the job table.
+Run with: python -m src.scripts.run_jobs [--threads N] [--once] [--status] [--retry-failed] [--purge-days N]
+
+By default it runs N worker threads (default 2) until interrupted. Set
+JOB_INLINE_WORKERS to 0 in the web app when workers run here instead.
+--once drains every due job and exits; --status prints counts by status.
+"""
+import json
+import sys
+import time
+from src import create_app
+from src.extension.db import db
+from src.services.jobs import job_queue
+
+app = create_app()
+
+def run_jobs(threads=2, once=False):
+    if once:
+        job_queue.work(app, once=True)
+        return
+    job_queue.start(app, threads)
+    print(f"Running {threads} job worker thread(s); Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        job_queue.stop()
+
+def job_maintenance(retry_failed=False, purge_days=None):
+    with app.app_context():
+        if retry_failed:
+            print(f"Requeued {job_queue.retry_failed(db.session)} failed jobs.")
+        if purge_days is not None:
+            print(f"Purged {job_queue.purge(db.session, purge_days)} finished jobs.")
+        db.session.commit()
+        print(json.dumps(job_queue.stats(db.session), indent=2))
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    purge_days = float(args[args.index('--purge-days') + 1]) if '--purge-days' in args else None
+    if '--status' in args or '--retry-failed' in args or purge_days is not None:
+        job_maintenance('--retry-failed' in args, purge_days)
+    else:
+        run_jobs(int(args[args.index('--threads') + 1]) if '--threads' in args else 2, '--once' in args)
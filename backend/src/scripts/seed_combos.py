@@ -4,13 +4,14 @@ Run with: python -m src.scripts.seed_combos
 """
 from src import create_app
 from src.extension.db import db
-from src.models import MenuItem, ComboDeal, ComboDealItem
+from src.models import MenuItem, ComboDeal, ComboDealItem, ComboPricing
 
 app = create_app()
 
 def seed_combos():
     with app.app_context():
         # Clear existing combos
+        ComboPricing.query.delete()
         ComboDealItem.query.delete()
         ComboDeal.query.delete()
         db.session.commit()
@@ -4,7 +4,8 @@ Seed script to populate the database with delicious menu items and coupons.
 from datetime import datetime, timedelta
 from src import create_app
 from src.extension.db import db
-from src.models import MenuItem, Coupon, User, Review
+from src.models import MenuItem, Coupon, CouponRedemption, CouponShard, User, Review
+from src.services.ratings import rebuild_rating_summaries
 
 app = create_app()
 
@@ -197,7 +198,9 @@ def seed_menu():
         db.session.commit()
         print(f"Successfully added {len(MENU_ITEMS)} menu items!")
 
-        # Clear existing coupons
+        # Clear existing coupons and their redemption state
+        CouponRedemption.query.delete()
+        CouponShard.query.delete()
         Coupon.query.delete()
         db.session.commit()
         print("Cleared existing coupons.")
@@ -247,6 +250,7 @@ def seed_menu():
                 )
                 db.session.add(review)
         
+        rebuild_rating_summaries(db.session)
         db.session.commit()
         print("Successfully added dummy users and reviews!")
 
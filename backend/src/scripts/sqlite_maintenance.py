@@ -0,0 +1,30 @@
+"""
+SQLite maintenance: checkpoint the WAL and refresh planner statistics.
+Run with: python -m src.scripts.sqlite_maintenance [--every SECONDS]
+
+Without --every it runs once; with it, it keeps running on that interval
+(e.g. as a sidecar process next to the web workers).
+"""
+import sys
+import time
+from src import create_app
+from src.extension.db import db
+from src.extension.sqlite import run_maintenance
+
+app = create_app()
+
+def sqlite_maintenance(interval=None):
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            print("Not a SQLite database; nothing to do.")
+            return
+        while True:
+            busy, log_frames, checkpointed = run_maintenance(db.engine)
+            print(f"Checkpointed {checkpointed}/{log_frames} WAL frames (busy={busy}); ANALYZE done.")
+            if not interval:
+                return
+            time.sleep(interval)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    sqlite_maintenance(float(args[args.index('--every') + 1]) if '--every' in args else None)
@@ -0,0 +1,87 @@
+"""
+Stress coupon redemption with concurrent checkouts and check it never over-redeems.
+Run with: python -m src.scripts.stress_coupons [--limit N] [--clients N] [--orders N]
+
+Every client logs in and places orders carrying the same coupon code
+through the real /api/orders endpoint against a throwaway database file.
+Exits non-zero if more orders got the coupon than its usage limit allows,
+or if the shard counters and the redemption ledger disagree.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from src import create_app
+from src.extension.db import db
+from src.extension.hashing import password_hasher
+from src.models import Coupon, CouponRedemption, CouponShard, MenuItem, Order, User
+
+
+def stress_coupons(limit=50, clients=16, orders=10):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "BCRYPT_LOG_ROUNDS": 4})
+    with app.app_context():
+        password_hash = password_hasher.hash("stress")
+        db.session.add_all(
+            User(username=f"stress{i}", email=f"stress{i}@example.com", password_hash=password_hash)
+            for i in range(clients)
+        )
+        item = MenuItem(name="Stress burger", price=10.0, category="Burgers")
+        db.session.add(item)
+        db.session.add(Coupon(code="STRESS", discount_percent=10, valid_until=datetime.utcnow() + timedelta(days=1), usage_limit=limit))
+        db.session.commit()
+        item_id = item.id
+
+    outcomes = {"placed": 0, "exhausted": 0, "errors": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(clients)
+
+    def client(i):
+        http = app.test_client()
+        http.post("/api/auth/login", json={"email": f"stress{i}@example.com", "password": "stress"})
+        start.wait()
+        for _ in range(orders):
+            response = http.post("/api/orders", json={
+                "items": [{"id": item_id, "quantity": 1}], "payment": "card", "type": "pickup", "coupon": "STRESS",
+            })
+            key = "placed" if response.status_code == 201 else "exhausted" if response.status_code == 400 else "errors"
+            with lock:
+                outcomes[key] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        placed = Order.query.count()
+        redeemed = CouponRedemption.query.count()
+        remaining = db.session.scalar(db.select(func.sum(CouponShard.remaining)))
+        negative = CouponShard.query.filter(CouponShard.remaining < 0).count()
+        db.engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    print(f"{clients} clients x {orders} checkouts against a limit of {limit} in {elapsed:.2f}s")
+    print(f"placed {outcomes['placed']}, rejected {outcomes['exhausted']}, errors {outcomes['errors']}")
+    print(f"orders {placed}, ledger rows {redeemed}, remaining {remaining}, negative shards {negative}")
+    ok = placed == redeemed == min(limit, clients * orders) and remaining == limit - redeemed and not negative
+    print("OK" if ok else "FAILED: coupon over- or under-redeemed")
+    return ok
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    ok = stress_coupons(
+        limit=int(args[args.index('--limit') + 1]) if '--limit' in args else 50,
+        clients=int(args[args.index('--clients') + 1]) if '--clients' in args else 16,
+        orders=int(args[args.index('--orders') + 1]) if '--orders' in args else 10,
+    )
+    sys.exit(0 if ok else 1)
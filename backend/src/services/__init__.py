@@ -0,0 +1,3 @@
+"""
+Services package - in-process caches and read models shared by routes
+"""
@@ -0,0 +1,55 @@
+"""
+Versioned in-process snapshot of the public menu catalog
+"""
+import hashlib
+import threading
+import time
+from flask import current_app
+
+
+class CatalogSnapshot:
+    """Holds the pre-serialized JSON body of the public menu.
+
+    Writers call ``invalidate()`` after committing a menu change, which bumps
+    the version and drops the cached body. The next reader rebuilds it once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._body = None
+        self._etag = None
+        self._built_at = 0.0
+
+    def invalidate(self):
+        """Bump the version and drop the cached body"""
+        with self._lock:
+            self.version += 1
+            self._body = None
+            self._etag = None
+
+    def get(self, build):
+        """Return ``(body, etag, version)``, calling ``build()`` on a miss.
+
+        ``build`` must return the JSON-serializable payload.
+        """
+        ttl = current_app.config.get("MENU_CACHE_TTL", 0)
+        with self._lock:
+            if self._body is not None and (not ttl or time.monotonic() - self._built_at < ttl):
+                return self._body, self._etag, self.version
+            version = self.version
+
+        payload = build()
+        body = current_app.json.dumps(payload).encode("utf-8")
+        etag = hashlib.sha1(body).hexdigest()
+
+        with self._lock:
+            # Only publish if no writer invalidated us while we were building
+            if self.version == version:
+                self._body = body
+                self._etag = etag
+                self._built_at = time.monotonic()
+        return body, etag, version
+
+
+menu_catalog = CatalogSnapshot()
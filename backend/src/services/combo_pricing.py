@@ -0,0 +1,141 @@
+"""
+Incrementally maintained combo pricing read model
+
+Flushes that touch a ``ComboDeal``, a ``ComboDealItem`` or the price,
+category, name or image of a ``MenuItem`` mark the affected combos as stale.
+Right before the transaction commits their ``ComboPricing`` rows are
+recomputed in a fixed number of queries, so the read model is written in the
+same transaction as the change that caused it.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.models import ComboDeal, ComboDealItem, ComboPricing, MenuItem
+
+PENDING_KEY = "combo_pricing_pending"
+TRACKED_MENU_FIELDS = ("price", "category", "name", "image_url")
+TRACKED_COMBO_FIELDS = ("combo_price", "category")
+
+
+def _pending(session):
+    return session.info.setdefault(PENDING_KEY, {"combos": set(), "menu_items": set()})
+
+
+def mark_combos_stale(session, combo_ids):
+    """Schedule combos for recomputation at commit (for bulk query updates/deletes)"""
+    _pending(session)["combos"].update(cid for cid in combo_ids if cid is not None)
+
+
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_combos(session, flush_context):
+    pending = _pending(session)
+    for obj in session.new:
+        if isinstance(obj, ComboDealItem):
+            pending["combos"].add(obj.combo_deal_id)
+        elif isinstance(obj, ComboDeal):
+            pending["combos"].add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, ComboDealItem):
+            # Include the previous combo if the item was moved between combos
+            history = inspect(obj).attrs.combo_deal_id.history
+            pending["combos"].update(history.added or [obj.combo_deal_id])
+            pending["combos"].update(history.deleted or [])
+        elif isinstance(obj, ComboDeal) and _changed(obj, TRACKED_COMBO_FIELDS):
+            pending["combos"].add(obj.id)
+        elif isinstance(obj, MenuItem) and _changed(obj, TRACKED_MENU_FIELDS):
+            pending["menu_items"].add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, ComboDealItem):
+            pending["combos"].add(obj.combo_deal_id)
+        elif isinstance(obj, ComboDeal):
+            pending["combos"].add(obj.id)
+    pending["combos"].discard(None)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_stale_combos(session):
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending or not (pending["combos"] or pending["menu_items"]):
+        return
+    combo_ids = set(pending["combos"])
+    if pending["menu_items"]:
+        combo_ids.update(
+            cid
+            for (cid,) in session.query(ComboDealItem.combo_deal_id)
+            .filter(ComboDealItem.menu_item_id.in_(pending["menu_items"]))
+            .distinct()
+        )
+    if combo_ids:
+        refresh_combo_pricing(session, combo_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_combos(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def refresh_combo_pricing(session, combo_ids):
+    """Recompute ``ComboPricing`` rows for the given combos.
+
+    Issues three queries regardless of how many combos or items are involved
+    and returns a dict of ``combo_deal_id -> ComboPricing``. The caller owns
+    the transaction.
+    """
+    combo_ids = set(combo_ids)
+    combos = {c.id: c for c in session.query(ComboDeal).filter(ComboDeal.id.in_(combo_ids))}
+    rows = (
+        session.query(ComboDealItem.combo_deal_id, ComboDealItem.quantity, MenuItem)
+        .join(MenuItem, ComboDealItem.menu_item_id == MenuItem.id)
+        .filter(ComboDealItem.combo_deal_id.in_(combo_ids))
+        .order_by(ComboDealItem.combo_deal_id, ComboDealItem.id)
+        .all()
+    )
+    existing = {
+        p.combo_deal_id: p
+        for p in session.query(ComboPricing).filter(ComboPricing.combo_deal_id.in_(combo_ids))
+    }
+
+    items_by_combo = {}
+    for combo_id, quantity, menu_item in rows:
+        items_by_combo.setdefault(combo_id, []).append({
+            'id': menu_item.id,
+            'name': menu_item.name,
+            'price': menu_item.price,
+            'quantity': quantity,
+            'image_url': menu_item.image_url,
+            'category': menu_item.category
+        })
+
+    result = {}
+    for combo_id in combo_ids:
+        combo = combos.get(combo_id)
+        pricing = existing.get(combo_id)
+        if combo is None:
+            # Combo was deleted; drop its read model row
+            if pricing is not None:
+                session.delete(pricing)
+            continue
+
+        items = items_by_combo.get(combo_id, [])
+        original_price = sum(i['price'] * i['quantity'] for i in items)
+
+        # Get category from combo or derive from its items
+        category = combo.category
+        if not category and items:
+            category = sorted(set(i['category'] for i in items))[0]
+
+        if pricing is None:
+            pricing = ComboPricing(combo_deal_id=combo_id)
+            session.add(pricing)
+        pricing.original_price = original_price
+        pricing.savings = original_price - combo.combo_price
+        pricing.category = category or "Mixed"
+        pricing.items = items
+        result[combo_id] = pricing
+    return result
@@ -0,0 +1,27 @@
+"""
+Atomic counter-row increments shared by the rollup tables
+"""
+from sqlalchemy import and_, insert, update
+from sqlalchemy.exc import IntegrityError
+
+
+def increment_row(session, table, keys, increments):
+    """Add ``increments`` to the row of ``table`` matching ``keys``, creating it if missing.
+
+    The row is bumped with a single ``UPDATE ... SET col = col + :n`` so
+    concurrent writers never lose an increment. When no row exists yet it is
+    inserted inside a savepoint; if another transaction inserted it first the
+    update is retried. Runs inside the caller's transaction.
+    """
+    bump = (
+        update(table)
+        .where(and_(*(table.c[k] == v for k, v in keys.items())))
+        .values({table.c[k]: table.c[k] + v for k, v in increments.items()})
+    )
+    if session.execute(bump).rowcount:
+        return
+    try:
+        with session.begin_nested():
+            session.execute(insert(table).values(**keys, **increments))
+    except IntegrityError:
+        session.execute(bump)
@@ -0,0 +1,187 @@
+"""
+Coupon code index and sharded, ledger-backed redemption
+"""
+import random
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from src.models import Coupon, CouponRedemption, CouponShard
+
+CouponEntry = namedtuple("CouponEntry", ["id", "code", "discount_percent", "valid_until", "usage_limit"])
+
+
+class CouponExhausted(Exception):
+    """Raised when a coupon has no redemptions left"""
+
+
+class CouponIndex:
+    """In-process ``code -> CouponEntry`` map for verification and checkout.
+
+    The coupon table is small, so it is loaded whole in one query and kept
+    for ``COUPON_INDEX_TTL`` seconds. Coupons that run out are remembered as
+    exhausted so the checkout field stops accepting them; redemption itself
+    is always decided by the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._exhausted = set()
+        self._loaded_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+
+    def mark_exhausted(self, coupon_id, exhausted=True):
+        with self._lock:
+            if exhausted:
+                self._exhausted.add(coupon_id)
+            else:
+                self._exhausted.discard(coupon_id)
+
+    def _load(self, session):
+        entries = {
+            code: CouponEntry(coupon_id, code, discount, valid_until, usage_limit)
+            for coupon_id, code, discount, valid_until, usage_limit in session.execute(
+                select(Coupon.id, Coupon.code, Coupon.discount_percent, Coupon.valid_until, Coupon.usage_limit)
+            )
+        }
+        exhausted = set(session.scalars(
+            select(CouponShard.coupon_id)
+            .group_by(CouponShard.coupon_id)
+            .having(func.sum(CouponShard.remaining) <= 0)
+        ))
+        with self._lock:
+            self._entries = entries
+            self._exhausted = exhausted
+            self._loaded_at = time.monotonic()
+        return entries
+
+    def lookup(self, session, code):
+        """Return the ``CouponEntry`` for ``code`` if it can currently be used, else None"""
+        ttl = current_app.config.get("COUPON_INDEX_TTL", 0)
+        with self._lock:
+            entries = self._entries
+            if entries is not None and ttl and time.monotonic() - self._loaded_at >= ttl:
+                entries = None
+        if entries is None:
+            entries = self._load(session)
+        entry = entries.get(code)
+        if entry is None or entry.valid_until <= datetime.utcnow() or (entry.usage_limit or 0) <= 0:
+            return None
+        with self._lock:
+            if entry.id in self._exhausted:
+                return None
+        return entry
+
+
+coupon_index = CouponIndex()
+
+
+def _take_from_shard(session, coupon_id, shard):
+    # Conditional decrement: never goes below zero however many checkouts race
+    return session.execute(
+        update(CouponShard)
+        .where(CouponShard.coupon_id == coupon_id, CouponShard.shard == shard, CouponShard.remaining > 0)
+        .values(remaining=CouponShard.remaining - 1)
+    ).rowcount
+
+
+def _create_shards(session, coupon_id, usage_limit):
+    """Split what is left of ``usage_limit`` across ``COUPON_SHARDS`` rows; False if another checkout won"""
+    shards = current_app.config.get("COUPON_SHARDS", 8)
+    used = session.scalar(
+        select(func.count()).select_from(CouponRedemption).where(CouponRedemption.coupon_id == coupon_id)
+    )
+    left = max((usage_limit or 0) - used, 0)
+    rows = [
+        {"coupon_id": coupon_id, "shard": i, "remaining": left // shards + (1 if i < left % shards else 0)}
+        for i in range(shards)
+    ]
+    try:
+        with session.begin_nested():
+            session.execute(insert(CouponShard), rows)
+    except IntegrityError:
+        return False  # Another checkout created them first
+    return True
+
+
+def _take_from_any_shard(session, entry):
+    """Walk the shards that still have redemptions left.
+
+    Returns ``(shard, settled)``: the shard taken or None, and whether the
+    shard rows already existed when we looked (so None means exhausted).
+    """
+    shards = select(CouponShard.shard, CouponShard.remaining).where(CouponShard.coupon_id == entry.id)
+    rows = session.execute(shards).all()
+    settled = bool(rows)
+    if not settled:
+        if _create_shards(session, entry.id, entry.usage_limit):
+            rows = session.execute(shards).all()
+        else:
+            # Under REPEATABLE READ (MySQL) a plain SELECT still reads the snapshot
+            # without the winner's rows; a locking read sees the committed ones
+            rows = session.execute(shards.with_for_update()).all()
+    candidates = [shard for shard, remaining in rows if remaining > 0]
+    random.shuffle(candidates)
+    for shard in candidates:
+        if _take_from_shard(session, entry.id, shard):
+            return shard, settled
+    return None, settled
+
+
+def redeem_coupon(session, entry, order_id, user_id, discount_amount):
+    """Take one redemption of ``entry`` for ``order_id`` inside the caller's transaction.
+
+    Tries one random shard first and falls back to every shard that still has
+    redemptions left, then records the ledger row. Shard rows are created on
+    the first redemption of a coupon from its ``usage_limit`` at that time;
+    a later change to the limit only applies after ``reset_coupon_shards``.
+    Raises ``CouponExhausted`` when none remain.
+    """
+    shard = random.randrange(current_app.config.get("COUPON_SHARDS", 8))
+    if not _take_from_shard(session, entry.id, shard):
+        shard, settled = _take_from_any_shard(session, entry)
+        if shard is None:
+            # Only remember it as exhausted when the shards were there before this checkout
+            if settled:
+                coupon_index.mark_exhausted(entry.id)
+            raise CouponExhausted()
+    session.execute(insert(CouponRedemption).values(
+        coupon_id=entry.id, order_id=order_id, user_id=user_id, shard=shard,
+        discount_amount=discount_amount, created_at=datetime.utcnow(),
+    ))
+    return shard
+
+
+def reset_coupon_shards(session, coupon_id):
+    """Drop a coupon's shard rows so the next redemption re-splits its current ``usage_limit``.
+
+    Call after changing ``usage_limit``, inside the same transaction.
+    """
+    session.execute(delete(CouponShard).where(CouponShard.coupon_id == coupon_id))
+    coupon_index.invalidate()
+    coupon_index.mark_exhausted(coupon_id, False)
+
+
+def release_coupon(session, order_id):
+    """Give the redemption held by ``order_id`` back to its shard; True if there was one"""
+    redemption = session.execute(
+        select(CouponRedemption.id, CouponRedemption.coupon_id, CouponRedemption.shard)
+        .where(CouponRedemption.order_id == order_id)
+    ).first()
+    if redemption is None:
+        return False
+    session.execute(
+        update(CouponShard)
+        .where(CouponShard.coupon_id == redemption.coupon_id, CouponShard.shard == redemption.shard)
+        .values(remaining=CouponShard.remaining + 1)
+    )
+    session.execute(delete(CouponRedemption).where(CouponRedemption.id == redemption.id))
+    coupon_index.mark_exhausted(redemption.coupon_id, False)
+    return True
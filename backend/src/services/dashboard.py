@@ -0,0 +1,100 @@
+"""
+Admin dashboard statistics computed in one pass and cached per process
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, func, select
+from src.models import MenuItem, Order, User
+
+
+def compute_dashboard_stats(session, now):
+    """All dashboard metrics from a single conditional-aggregation statement"""
+    today_start = datetime.combine(now.date(), datetime.min.time())
+    week_start = now - timedelta(days=7)
+    month_start = datetime(now.year, now.month, 1)
+
+    def sales_since(start):
+        return func.coalesce(func.sum(case((Order.created_at >= start, Order.total_amount), else_=0)), 0)
+
+    def orders_since(start):
+        return func.coalesce(func.sum(case((Order.created_at >= start, 1), else_=0)), 0)
+
+    row = session.execute(
+        select(
+            sales_since(today_start),
+            orders_since(today_start),
+            sales_since(week_start),
+            orders_since(week_start),
+            sales_since(month_start),
+            orders_since(month_start),
+            func.coalesce(func.sum(Order.total_amount), 0),
+            func.count(Order.id),
+            func.coalesce(func.sum(case((Order.status == "pending", 1), else_=0)), 0),
+            select(func.count(User.id)).scalar_subquery(),
+            select(func.count(MenuItem.id)).scalar_subquery(),
+        ).select_from(Order)
+    ).one()
+
+    (today_sales, today_orders, week_sales, week_orders, month_sales, month_orders,
+     total_sales, total_orders, pending_orders, total_users, total_menu_items) = row
+
+    return {
+        "today": {"sales": float(today_sales), "orders": int(today_orders)},
+        "week": {"sales": float(week_sales), "orders": int(week_orders)},
+        "month": {"sales": float(month_sales), "orders": int(month_orders)},
+        "total": {
+            "sales": float(total_sales),
+            "orders": int(total_orders),
+            "users": int(total_users),
+            "menu_items": int(total_menu_items),
+            "pending_orders": int(pending_orders),
+        },
+    }
+
+
+class DashboardStatsCache:
+    """Single-entry TTL cache for the dashboard payload.
+
+    The TTL comes from ``DASHBOARD_STATS_TTL``; order creation and status
+    changes call ``invalidate()`` so admins see their own writes at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._stats = None
+        self._meta = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        """Bump the version and drop the cached payload"""
+        with self._lock:
+            self.version += 1
+            self._stats = None
+
+    def get(self, session):
+        """Return ``(stats, meta)``; ``meta`` reports timing and cache status"""
+        with self._lock:
+            if self._stats is not None and time.monotonic() < self._expires_at:
+                return self._stats, dict(self._meta, cached=True)
+            version = self.version
+
+        started = time.perf_counter()
+        stats = compute_dashboard_stats(session, datetime.utcnow())
+        meta = {
+            "computed_at": datetime.utcnow().isoformat(),
+            "compute_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+        with self._lock:
+            # Only publish if no order write invalidated us while we were computing
+            if self.version == version:
+                self._stats = stats
+                self._meta = meta
+                self._expires_at = time.monotonic() + current_app.config.get("DASHBOARD_STATS_TTL", 0)
+        return stats, dict(meta, cached=False)
+
+
+dashboard_stats = DashboardStatsCache()
@@ -0,0 +1,102 @@
+"""
+Streaming order exports for accounting
+"""
+import csv
+import io
+import json
+from sqlalchemy import select
+from src.models import Order, OrderItem, User
+
+CHUNK_SIZE = 2000
+
+CSV_COLUMNS = [
+    "order_id", "created_at", "customer", "status", "order_type", "payment_method",
+    "total_amount", "line_id", "menu_item_id", "combo_deal_id", "item_name", "quantity", "price",
+]
+
+
+def order_lines_statement(filters):
+    """One row per order line (or per order without lines), ordered by order then line id"""
+    return (
+        select(
+            Order.id.label("order_id"),
+            Order.created_at,
+            User.username.label("customer"),
+            Order.status,
+            Order.order_type,
+            Order.payment_method,
+            Order.total_amount,
+            OrderItem.id.label("line_id"),
+            OrderItem.menu_item_id,
+            OrderItem.combo_deal_id,
+            OrderItem.name.label("item_name"),
+            OrderItem.quantity,
+            OrderItem.price,
+        )
+        .join(User, User.id == Order.user_id)
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .where(*filters)
+        .order_by(Order.id, OrderItem.id)
+    )
+
+
+def iter_order_lines(engine, filters, chunk_size=CHUNK_SIZE):
+    """Yield lists of rows using a server-side cursor so memory stays flat"""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+            order_lines_statement(filters)
+        )
+        for partition in result.partitions():
+            yield partition
+
+
+def csv_chunks(partitions):
+    """Render row partitions as CSV text, one chunk per partition"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for rows in partitions:
+        for row in rows:
+            writer.writerow([
+                row.created_at.isoformat() if name == "created_at" else getattr(row, name)
+                for name in CSV_COLUMNS
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(partitions):
+    """Render row partitions as newline-delimited JSON, one order per line with its items nested"""
+    current = None
+    for rows in partitions:
+        lines = []
+        for row in rows:
+            if current is None or current["id"] != row.order_id:
+                if current is not None:
+                    lines.append(json.dumps(current))
+                current = {
+                    "id": row.order_id,
+                    "date": row.created_at.isoformat(),
+                    "customer": row.customer,
+                    "status": row.status,
+                    "type": row.order_type,
+                    "payment": row.payment_method,
+                    "total": row.total_amount,
+                    "items": [],
+                }
+            if row.line_id is not None:
+                current["items"].append({
+                    "id": row.line_id,
+                    "menu_item_id": row.menu_item_id,
+                    "combo_deal_id": row.combo_deal_id,
+                    "name": row.item_name,
+                    "quantity": row.quantity,
+                    "price": row.price,
+                })
+        if lines:
+            yield "\n".join(lines) + "\n"
+    if current is not None:
+        yield json.dumps(current) + "\n"
@@ -0,0 +1,191 @@
+"""
+Upload image pipeline: content-hash storage with resized and WebP variants
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from src.services.catalog import menu_catalog
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it only the original is stored
+    Image = None
+
+UPLOAD_URL_PREFIX = '/api/uploads/'
+DEFAULT_VARIANT_WIDTHS = {"thumb": 320, "medium": 768, "full": 1600}
+DIGEST_LENGTH = 32
+
+
+def _is_digest(stem):
+    return len(stem) == DIGEST_LENGTH and all(c in '0123456789abcdef' for c in stem)
+
+
+def is_content_addressed(filename):
+    """True for an original or variant image stored under its content hash"""
+    stem, _, ext = filename.rpartition('.')
+    return ext != 'json' and _is_digest(stem.split('_', 1)[0])
+
+
+def _write_atomic(path, data):
+    # Concurrent uploads of the same content race to the same name; rename is atomic
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ImagePipeline:
+    """Stores uploads under a content-hash name and renders their variants.
+
+    ``<digest>.<ext>`` is the untouched original. For each configured width a
+    background job writes ``<digest>_<name>.jpg`` (``.png`` when the source has
+    transparency) and ``<digest>_<name>.webp``, then a ``<digest>.json``
+    manifest. Payloads only advertise variants once the manifest exists.
+    A missing manifest is remembered for ``IMAGE_MANIFEST_MISS_TTL`` seconds
+    so listings don't retry the open() on every request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._manifests = {}
+        self._missing = {}  # digest -> monotonic time to look for its manifest again
+        self.widths = DEFAULT_VARIANT_WIDTHS
+        self.quality = 82
+        self.miss_ttl = 10
+
+    def init_app(self, app):
+        self.widths = app.config.get("IMAGE_VARIANT_WIDTHS", DEFAULT_VARIANT_WIDTHS)
+        self.quality = app.config.get("IMAGE_QUALITY", 82)
+        self.miss_ttl = app.config.get("IMAGE_MANIFEST_MISS_TTL", 10)
+
+    def store(self, data, ext, folder):
+        """Write ``data`` under its content hash and return the filename"""
+        digest = hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+        filename = f"{digest}.{ext}"
+        path = os.path.join(folder, filename)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        return filename
+
+    def needs_variants(self, filename, folder):
+        """True when ``filename`` can be rendered and has no manifest yet"""
+        digest = filename.rsplit('.', 1)[0]
+        return Image is not None and _is_digest(digest) and not os.path.exists(os.path.join(folder, f"{digest}.json"))
+
+    def render_variants(self, folder, filename):
+        """Render every configured variant of ``filename`` and write its manifest"""
+        digest = filename.rsplit('.', 1)[0]
+        with Image.open(os.path.join(folder, filename)) as source:
+            # Phone photos store rotation in EXIF; bake it in before resizing
+            source = ImageOps.exif_transpose(source)
+            has_alpha = source.mode in ('RGBA', 'LA') or (source.mode == 'P' and 'transparency' in source.info)
+            base = source.convert('RGBA' if has_alpha else 'RGB')
+        fmt, ext = ('PNG', 'png') if has_alpha else ('JPEG', 'jpg')
+
+        manifest = {}
+        previous = None
+        for name, width in sorted(self.widths.items(), key=lambda kv: kv[1]):
+            if previous is not None and previous['width'] == base.width:
+                # Never upscale: larger sizes of a small source reuse the last files
+                manifest[name] = previous
+                continue
+            image = base
+            if base.width > width:
+                image = base.resize((width, max(1, round(base.height * width / base.width))), Image.LANCZOS)
+            stem = f"{digest}_{name}"
+            image.save(os.path.join(folder, f"{stem}.{ext}"), fmt, quality=self.quality, optimize=True)
+            image.save(os.path.join(folder, f"{stem}.webp"), 'WEBP', quality=self.quality, method=4)
+            manifest[name] = previous = {'width': image.width, 'src': f"{stem}.{ext}", 'webp': f"{stem}.webp"}
+
+        _write_atomic(os.path.join(folder, f"{digest}.json"), json.dumps(manifest).encode('utf-8'))
+        with self._lock:
+            self._manifests[digest] = manifest
+            self._missing.pop(digest, None)
+        # Cached menu payloads were built without the variant map
+        menu_catalog.invalidate()
+        return manifest
+
+    def _manifest(self, digest, folder):
+        manifest = self._manifests.get(digest)
+        if manifest is not None:
+            return manifest
+        retry_at = self._missing.get(digest)
+        if retry_at is not None and retry_at > time.monotonic():
+            return None
+        try:
+            with open(os.path.join(folder, f"{digest}.json"), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self._missing[digest] = time.monotonic() + self.miss_ttl
+            return None
+        with self._lock:
+            self._manifests[digest] = manifest
+            self._missing.pop(digest, None)
+        return manifest
+
+    def manifests_appeared(self, folder):
+        """True when a manifest remembered as missing now exists on disk.
+
+        Variants are usually rendered by a job in another process, and its
+        ``menu_catalog.invalidate()`` only reaches that process. Callers
+        holding cached payloads poll this instead; each missing manifest is
+        looked for at most once per ``miss_ttl``.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [digest for digest, retry_at in self._missing.items() if retry_at <= now]
+        appeared = False
+        for digest in due:
+            found = os.path.exists(os.path.join(folder, f"{digest}.json"))
+            with self._lock:
+                if found:
+                    self._missing.pop(digest, None)
+                else:
+                    self._missing[digest] = now + self.miss_ttl
+            appeared = appeared or found
+        return appeared
+
+    def variants(self, image_url, folder):
+        """``srcset``-style variant map for an uploaded image URL, or None"""
+        if not image_url or not image_url.startswith(UPLOAD_URL_PREFIX):
+            return None
+        digest = image_url[len(UPLOAD_URL_PREFIX):].rsplit('.', 1)[0]
+        if not _is_digest(digest):
+            return None
+        manifest = self._manifest(digest, folder)
+        if not manifest:
+            return None
+        distinct = list({v['width']: v for v in manifest.values()}.values())
+        return {
+            'srcset': ', '.join(f"{UPLOAD_URL_PREFIX}{v['src']} {v['width']}w" for v in distinct),
+            'webp_srcset': ', '.join(f"{UPLOAD_URL_PREFIX}{v['webp']} {v['width']}w" for v in distinct),
+            'sizes': {
+                name: {'width': v['width'], 'url': UPLOAD_URL_PREFIX + v['src'], 'webp': UPLOAD_URL_PREFIX + v['webp']}
+                for name, v in manifest.items()
+            },
+        }
+
+    def delete(self, filename, folder):
+        """Remove an upload together with its variants and manifest"""
+        digest = filename.rsplit('.', 1)[0]
+        paths = [filename]
+        if _is_digest(digest):
+            manifest = self._manifest(digest, folder) or {}
+            for v in manifest.values():
+                paths += [v['src'], v['webp']]
+            paths = list(dict.fromkeys(paths))
+            paths.append(f"{digest}.json")
+            with self._lock:
+                self._manifests.pop(digest, None)
+                self._missing.pop(digest, None)
+        for name in paths:
+            try:
+                os.remove(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,251 @@
+"""
+Durable background jobs stored in the ``job`` table
+
+Request handlers ``enqueue`` work inside their own transaction, so a job
+exists only if the change that needed it committed. Workers claim queued
+jobs with a conditional UPDATE, run the registered task and either mark the
+job done or push it back with exponential backoff until ``max_attempts``.
+"""
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, event, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.extension.db import db
+from src.models import Job
+
+ENQUEUED_KEY = "jobs_enqueued"
+
+
+class JobQueue:
+    """Task registry plus the in-process worker threads"""
+
+    def __init__(self):
+        self.tasks = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def init_app(self, app):
+        @app.before_request
+        def _start_inline_workers():
+            # Web processes run a few worker threads unless JOB_INLINE_WORKERS is 0
+            if app.config.get("JOB_INLINE_WORKERS"):
+                self.start(app, app.config["JOB_INLINE_WORKERS"])
+
+    def task(self, name):
+        """Register ``fn(payload)`` as the handler for jobs called ``name``"""
+        def decorator(fn):
+            self.tasks[name] = fn
+            return fn
+        return decorator
+
+    def enqueue(self, session, name, payload=None, key=None, delay=0, max_attempts=None):
+        """Queue ``name`` inside the caller's transaction; returns the job id.
+
+        With a ``key``, enqueueing the same key again returns the existing job
+        instead of creating a second one. A finished job is queued to run
+        again, and a running one is flagged to run once more when it ends, since
+        it may already have read the state this caller just changed.
+        """
+        if name not in self.tasks:
+            raise ValueError(f"Unknown job: {name}")
+        if key is not None:
+            existing = session.scalar(select(Job.id).where(Job.key == key))
+            if existing is not None:
+                # Two rounds: a running job may finish between the two UPDATEs
+                for _ in range(2):
+                    requeued = session.execute(
+                        update(Job)
+                        .where(Job.id == existing, Job.status.in_(("done", "failed")))
+                        .values(status="queued", payload=payload or {}, attempts=0, last_error=None,
+                                run_at=datetime.utcnow() + timedelta(seconds=delay), finished_at=None)
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+                    if requeued:
+                        session.info[ENQUEUED_KEY] = True
+                        break
+                    flagged = session.execute(
+                        update(Job)
+                        .where(Job.id == existing, Job.status == "running")
+                        .values(rerun=True, payload=payload or {})
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+                    if flagged:
+                        break
+                    if session.scalar(select(Job.status).where(Job.id == existing)) == "queued":
+                        break  # Still waiting to run, so it will see this caller's changes
+                return existing
+        job = Job(
+            name=name,
+            key=key,
+            payload=payload or {},
+            max_attempts=max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 5),
+            run_at=datetime.utcnow() + timedelta(seconds=delay),
+        )
+        try:
+            with session.begin_nested():
+                session.add(job)
+        except IntegrityError:
+            # Another request enqueued the same key first
+            return session.scalar(select(Job.id).where(Job.key == key))
+        session.info[ENQUEUED_KEY] = True
+        return job.id
+
+    def wake(self):
+        self._wake.set()
+
+    # Workers
+
+    def start(self, app, threads):
+        """Start ``threads`` worker threads in this process (once per process)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self.work, args=(app,), name=f"jobs-{i}", daemon=True)
+                for i in range(threads)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+
+    def work(self, app, once=False):
+        """Worker loop: claim and run jobs until stopped (or until idle with ``once``)"""
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+        interval = app.config.get("JOB_POLL_INTERVAL", 2.0)
+        while not self._stopping.is_set():
+            with app.app_context():
+                try:
+                    job = self.claim(db.session, worker_id)
+                    if job is not None:
+                        self.run(db.session, job)
+                except Exception as e:
+                    print(f"Job worker error: {e}")
+                    job = None
+                finally:
+                    db.session.remove()
+            if job is None:
+                if once:
+                    return
+                self._wake.wait(interval)
+                self._wake.clear()
+
+    def claim(self, session, worker_id):
+        """Atomically take the next due job; returns a plain dict or None"""
+        now = datetime.utcnow()
+        lease = timedelta(seconds=current_app.config.get("JOB_LEASE_SECONDS", 300))
+        due = or_(
+            (Job.status == "queued") & (Job.run_at <= now),
+            # A worker that died mid-job leaves it running; take it over once the lease expires
+            (Job.status == "running") & (Job.locked_at < now - lease),
+        )
+        for candidate in session.scalars(select(Job.id).where(due).order_by(Job.run_at).limit(5)).all():
+            claimed = session.execute(
+                update(Job)
+                .where(Job.id == candidate, due)
+                .values(status="running", locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if claimed:
+                row = session.execute(
+                    select(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts).where(Job.id == candidate)
+                ).one()
+                session.commit()
+                return row._asdict()
+        session.rollback()
+        return None
+
+    def run(self, session, job):
+        """Run a claimed job and record the outcome"""
+        try:
+            self.tasks[job["name"]](job["payload"])
+        except Exception as e:
+            session.rollback()
+            if job["attempts"] >= job["max_attempts"]:
+                values = {"status": "failed", "finished_at": datetime.utcnow()}
+            else:
+                values = {"status": "queued", "run_at": datetime.utcnow() + self.backoff(job["attempts"])}
+            values["last_error"] = "".join(traceback.format_exception_only(type(e), e)).strip()[:2000]
+        else:
+            session.commit()
+            values = {"status": "done", "finished_at": datetime.utcnow(), "last_error": None}
+        # The rerun flag is only set while the job is running, so one of these matches
+        # unless the flag lands between them, in which case the second round catches it
+        for _ in range(2):
+            if session.execute(
+                update(Job).where(Job.id == job["id"], Job.rerun == True)
+                .values(status="queued", rerun=False, attempts=0, run_at=datetime.utcnow(), finished_at=None,
+                        locked_by=None, locked_at=None, last_error=values["last_error"])
+                .execution_options(synchronize_session=False)
+            ).rowcount:
+                values["status"] = "queued"
+                break
+            if session.execute(
+                update(Job).where(Job.id == job["id"], Job.rerun == False)
+                .values(locked_by=None, locked_at=None, **values)
+                .execution_options(synchronize_session=False)
+            ).rowcount:
+                break
+        session.commit()
+        if values["status"] == "queued":
+            self.wake()
+        return values["status"]
+
+    def backoff(self, attempts):
+        """Delay before retry number ``attempts``: exponential with a little jitter"""
+        base = current_app.config.get("JOB_RETRY_BASE", 5)
+        delay = min(base * 2 ** (attempts - 1), current_app.config.get("JOB_RETRY_MAX", 3600))
+        return timedelta(seconds=delay * random.uniform(1.0, 1.2))
+
+    def stats(self, session):
+        counts = dict(session.execute(select(Job.status, func.count()).group_by(Job.status)).all())
+        oldest = session.scalar(select(func.min(Job.run_at)).where(Job.status == "queued"))
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "oldest_queued": oldest.isoformat() if oldest else None,
+        }
+
+    def retry_failed(self, session):
+        """Queue every failed job again with a fresh attempt budget; returns the count"""
+        return session.execute(
+            update(Job).where(Job.status == "failed")
+            .values(status="queued", attempts=0, run_at=datetime.utcnow(), finished_at=None)
+        ).rowcount
+
+    def purge(self, session, days):
+        """Delete jobs that finished successfully more than ``days`` days ago"""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return session.execute(delete(Job).where(Job.status == "done", Job.finished_at < cutoff)).rowcount
+
+
+job_queue = JobQueue()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session):
+    # Let in-process workers pick up freshly committed jobs without waiting for the next poll
+    if session.info.pop(ENQUEUED_KEY, None):
+        job_queue.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session):
+    session.info.pop(ENQUEUED_KEY, None)
@@ -0,0 +1,279 @@
+"""
+Live kitchen order feed: change log, in-process broadcaster and pub/sub backends
+
+Routes call ``record_order_event`` inside the transaction that changes an
+order. The ``OrderEvent`` row gets its id when the transaction flushes, and
+once it commits the event goes to the configured pub/sub backend. That
+backend feeds the broadcaster, which fans events out to the SSE streams of
+this process.
+
+Autoincrement ids are handed out at insert time but become visible at
+commit, so on MySQL an event can commit after one with a higher id.
+Readers of the log therefore re-scan a trailing window of
+``ORDER_FEED_LAG_WINDOW`` ids below their cursor and skip ids they already
+delivered (``DeliveredIds``) instead of trusting ``id > max seen``.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from src.extension.db import db
+from src.models import OrderEvent
+
+PENDING_KEY = "order_feed_pending"
+READY_KEY = "order_feed_ready"
+OVERFLOW = object()
+
+
+def record_order_event(session, order_id, kind, payload):
+    """Log an order change in the caller's transaction; it is published after commit"""
+    row = OrderEvent(order_id=order_id, kind=kind, payload=payload, created_at=datetime.utcnow())
+    session.add(row)
+    session.info.setdefault(PENDING_KEY, []).append(row)
+
+
+def event_dict(row):
+    return {
+        "id": row.id,
+        "order_id": row.order_id,
+        "kind": row.kind,
+        "data": row.payload,
+        "at": row.created_at.isoformat(),
+    }
+
+
+def latest_event_id(session):
+    """Current head of the change log, used as the cursor for a fresh client"""
+    return session.scalar(select(func.max(OrderEvent.id))) or 0
+
+
+class DeliveredIds:
+    """Ids already delivered within ``window`` of the highest one (the cursor)"""
+
+    def __init__(self, cursor, window):
+        self.cursor = cursor
+        self.window = window
+        self.ids = set()
+
+    @property
+    def floor(self):
+        return max(self.cursor - self.window, 0)
+
+    def prime(self, session):
+        """Treat everything already committed inside the window as delivered"""
+        self.ids.update(session.scalars(
+            select(OrderEvent.id).where(OrderEvent.id > self.floor, OrderEvent.id <= self.cursor)
+        ))
+
+    def add(self, event_id):
+        """Record a delivery; False if it was already delivered or fell out of the window"""
+        if event_id <= self.floor or event_id in self.ids:
+            return False
+        self.ids.add(event_id)
+        if event_id > self.cursor:
+            self.cursor = event_id
+            floor = self.floor
+            self.ids = {i for i in self.ids if i > floor}
+        return True
+
+    def missed(self, session, limit):
+        """Undelivered events after the floor, oldest first"""
+        return session.scalars(
+            select(OrderEvent)
+            .where(OrderEvent.id > self.floor, OrderEvent.id.notin_(self.ids))
+            .order_by(OrderEvent.id)
+            .limit(limit)
+        ).all()
+
+
+@event.listens_for(Session, "before_commit")
+def _capture_order_events(session):
+    rows = session.info.pop(PENDING_KEY, None)
+    if not rows:
+        return
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    # Ids are only known after the flush; keep plain dicts for after_commit
+    session.info.setdefault(READY_KEY, []).extend(event_dict(row) for row in rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_order_events(session):
+    for item in session.info.pop(READY_KEY, []):
+        order_feed.pubsub.publish(item)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_order_events(session):
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(READY_KEY, None)
+
+
+class Broadcaster:
+    """Fans events out to every subscribed stream in this process.
+
+    Each subscriber has a bounded queue. A subscriber that falls too far
+    behind is sent ``OVERFLOW`` instead and catches up from the change log.
+    """
+
+    def __init__(self, maxsize=1000):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self.maxsize = maxsize
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=self.maxsize)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, item):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(item)
+            except queue.Full:
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(OVERFLOW)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+class LocalPubSub:
+    """Delivers events straight to this process's broadcaster (single worker)"""
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+
+    def start(self, app):
+        pass
+
+    def publish(self, item):
+        self.broadcaster.publish(item)
+
+
+class DatabasePollingPubSub:
+    """Every worker tails the ``order_event`` table, so events reach all processes.
+
+    ``publish`` is a no-op because the committed row already is the message.
+    One daemon thread per process polls every ``ORDER_FEED_POLL_INTERVAL``
+    seconds for rows it has not delivered yet, including late commits below
+    the highest id it has seen.
+    """
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self, app):
+        # Started lazily and per process so forked workers get their own poller
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._poll, args=(app,), name="order-feed-poller", daemon=True).start()
+
+    def publish(self, item):
+        pass
+
+    def _poll(self, app):
+        interval = app.config.get("ORDER_FEED_POLL_INTERVAL", 1.0)
+        with app.app_context():
+            delivered = DeliveredIds(latest_event_id(db.session), app.config.get("ORDER_FEED_LAG_WINDOW", 200))
+            delivered.prime(db.session)
+            db.session.remove()
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    for row in delivered.missed(db.session, 500):
+                        if delivered.add(row.id):
+                            self.broadcaster.publish(event_dict(row))
+                    db.session.remove()
+            except Exception as e:
+                print(f"Error polling order events: {e}")
+
+
+PUBSUB_BACKENDS = {"local": LocalPubSub, "database": DatabasePollingPubSub}
+
+
+def format_sse(item, name="order"):
+    return f"id: {item['id']}\nevent: {name}\ndata: {json.dumps(item)}\n\n"
+
+
+class OrderFeed:
+    """Server-Sent Events stream of order changes with resumable cursors"""
+
+    def __init__(self):
+        self.broadcaster = Broadcaster()
+        self.pubsub = LocalPubSub(self.broadcaster)
+
+    def init_app(self, app):
+        backend = app.config.get("ORDER_FEED_PUBSUB", "local")
+        # Either a registered name or a class taking the broadcaster
+        backend_class = PUBSUB_BACKENDS[backend] if isinstance(backend, str) else backend
+        self.pubsub = backend_class(self.broadcaster)
+
+    def stream(self, cursor=None):
+        """Yield SSE frames: everything after ``cursor`` from the log, then live events.
+
+        Must run under ``stream_with_context``. A client further behind than
+        ``ORDER_FEED_REPLAY_LIMIT`` events gets a ``reset`` event and should
+        reload the order list. A resumed stream re-sends the trailing window
+        below ``cursor``, so clients must apply events idempotently.
+        """
+        config = current_app.config
+        self.pubsub.start(current_app._get_current_object())
+        heartbeat = config.get("ORDER_FEED_HEARTBEAT", 15)
+        limit = config.get("ORDER_FEED_REPLAY_LIMIT", 500)
+        window = config.get("ORDER_FEED_LAG_WINDOW", 200)
+        subscriber = self.broadcaster.subscribe()
+        try:
+            if cursor is None:
+                delivered = DeliveredIds(latest_event_id(db.session), window)
+                delivered.prime(db.session)
+            else:
+                delivered = DeliveredIds(cursor, window)
+            yield "retry: 3000\n\n"
+            while True:
+                # Catch up from the change log; the subscription is already open so nothing slips between
+                missed = [event_dict(row) for row in delivered.missed(db.session, limit + 1)]
+                db.session.remove()  # Don't hold a pooled connection while idle
+                if len(missed) > limit:
+                    delivered = DeliveredIds(latest_event_id(db.session), window)
+                    delivered.prime(db.session)
+                    db.session.remove()
+                    yield format_sse({"id": delivered.cursor}, "reset")
+                    continue
+                for item in missed:
+                    if delivered.add(item["id"]):
+                        yield format_sse(item)
+                while True:
+                    try:
+                        item = subscriber.get(timeout=heartbeat)
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
+                        continue
+                    if item is OVERFLOW:
+                        break
+                    if delivered.add(item["id"]):
+                        yield format_sse(item)
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+
+
+order_feed = OrderFeed()
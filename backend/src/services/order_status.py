@@ -0,0 +1,91 @@
+"""
+Order status state machine and set-based status transitions
+"""
+from collections import defaultdict
+from sqlalchemy import select, update
+from src.models import Order
+from src.services.coupons import release_coupon
+from src.services.order_feed import record_order_event
+
+# Allowed moves, mirroring the buttons on the admin orders screen
+ORDER_TRANSITIONS = {
+    "pending": {"accepted", "preparing", "denied", "cancelled"},
+    "accepted": {"preparing", "cancelled"},
+    "preparing": {"ready", "cancelled"},
+    "ready": {"on_the_way", "delivered", "picked_up"},
+    "on_the_way": {"delivered"},
+    "delivered": set(),
+    "picked_up": set(),
+    "denied": set(),
+    "cancelled": set(),
+}
+# Statuses that only make sense for one order_type
+ORDER_TYPE_ONLY = {"on_the_way": "delivery", "delivered": "delivery", "picked_up": "pickup"}
+# Orders that end here give their coupon redemption back
+RELEASES_COUPON = {"denied", "cancelled"}
+
+
+def transition_error(current, target, order_type):
+    """Why ``current -> target`` is not allowed for an order of ``order_type``, or None"""
+    if target not in ORDER_TRANSITIONS.get(current, ()):
+        return f"Cannot move order from {current} to {target}"
+    if ORDER_TYPE_ONLY.get(target, order_type) != order_type:
+        return f"{target} does not apply to {order_type} orders"
+    return None
+
+
+def transition_orders(session, order_ids, target, from_status=None):
+    """Move ``order_ids`` to ``target`` inside the caller's transaction.
+
+    Current statuses are read in one query. Every group of orders that may
+    legally move issues one ``UPDATE ... WHERE id IN (...) AND status =
+    :from``, so an order changed concurrently is reported as a conflict
+    instead of being overwritten. Returns one result dict per requested id.
+    """
+    if target not in ORDER_TRANSITIONS:
+        raise ValueError(f"Unknown status: {target}")
+    ids = list(dict.fromkeys(order_ids))
+    current = {
+        row.id: row for row in session.execute(
+            select(Order.id, Order.status, Order.order_type).where(Order.id.in_(ids))
+        )
+    }
+
+    results = {}
+    groups = defaultdict(list)
+    for order_id in ids:
+        row = current.get(order_id)
+        if row is None:
+            results[order_id] = {"id": order_id, "ok": False, "error": "Order not found"}
+            continue
+        error = transition_error(row.status, target, row.order_type)
+        if error is None and from_status is not None and row.status != from_status:
+            error = f"Order is {row.status}, not {from_status}"
+        if error:
+            results[order_id] = {"id": order_id, "ok": False, "status": row.status, "error": error}
+        else:
+            groups[row.status].append(order_id)
+
+    for status, group in groups.items():
+        moved = session.execute(
+            update(Order)
+            .where(Order.id.in_(group), Order.status == status)
+            .values(status=target)
+        ).rowcount
+        if moved != len(group):
+            # Lost a race for some rows; find out which ones actually moved
+            moved_ids = set(session.scalars(
+                select(Order.id).where(Order.id.in_(group), Order.status == target)
+            ))
+        else:
+            moved_ids = set(group)
+        for order_id in group:
+            if order_id not in moved_ids:
+                results[order_id] = {"id": order_id, "ok": False, "error": "Order changed concurrently"}
+                continue
+            if target in RELEASES_COUPON:
+                release_coupon(session, order_id)
+            record_order_event(session, order_id, "status", {"status": target, "previous": status})
+            results[order_id] = {"id": order_id, "ok": True, "status": target, "previous": status}
+
+    return [results[order_id] for order_id in ids]
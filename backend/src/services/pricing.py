@@ -0,0 +1,76 @@
+"""
+In-memory price index used to resolve order lines server-side
+"""
+import threading
+import time
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import literal, select, union_all
+from src.models import ComboDeal, MenuItem
+
+PriceEntry = namedtuple("PriceEntry", ["name", "price", "available"])
+
+
+class PriceIndex:
+    """Caches ``(kind, id) -> PriceEntry`` for menu items and combos.
+
+    Lookups for ids not yet cached are resolved together in a single
+    ``UNION ALL`` of two ``IN (...)`` selects. Menu edits call
+    ``invalidate()``; ``PRICE_INDEX_TTL`` bounds staleness for changes made
+    by other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = {}
+            self._loaded_at = time.monotonic()
+
+    def resolve(self, session, menu_ids, combo_ids):
+        """Return ``(menu_items, combos)`` dicts of ``id -> PriceEntry``; unknown ids are omitted"""
+        wanted = {("menu", i) for i in menu_ids} | {("combo", i) for i in combo_ids}
+        ttl = current_app.config.get("PRICE_INDEX_TTL", 0)
+        with self._lock:
+            if ttl and time.monotonic() - self._loaded_at >= ttl:
+                self._entries = {}
+                self._loaded_at = time.monotonic()
+            found = {key: self._entries[key] for key in wanted if key in self._entries}
+
+        missing = wanted - found.keys()
+        if missing:
+            fetched = self._fetch(session, missing)
+            found.update(fetched)
+            with self._lock:
+                self._entries.update(fetched)
+
+        menu_items = {i: e for (kind, i), e in found.items() if kind == "menu"}
+        combos = {i: e for (kind, i), e in found.items() if kind == "combo"}
+        return menu_items, combos
+
+    @staticmethod
+    def _fetch(session, keys):
+        menu_ids = [i for kind, i in keys if kind == "menu"]
+        combo_ids = [i for kind, i in keys if kind == "combo"]
+        selects = []
+        if menu_ids:
+            selects.append(
+                select(literal("menu"), MenuItem.id, MenuItem.name, MenuItem.price, MenuItem.availability)
+                .where(MenuItem.id.in_(menu_ids))
+            )
+        if combo_ids:
+            selects.append(
+                select(literal("combo"), ComboDeal.id, ComboDeal.name, ComboDeal.combo_price, ComboDeal.is_active)
+                .where(ComboDeal.id.in_(combo_ids))
+            )
+        statement = union_all(*selects) if len(selects) > 1 else selects[0]
+        return {
+            (kind, row_id): PriceEntry(name, price, bool(available))
+            for kind, row_id, name, price, available in session.execute(statement)
+        }
+
+
+price_index = PriceIndex()
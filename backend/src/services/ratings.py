@@ -0,0 +1,61 @@
+"""
+Incrementally maintained rating summaries for menu items and combos
+"""
+from sqlalchemy import func, insert
+from src.models import RatingSummary, Review
+from src.services.counters import increment_row
+
+STARS = range(1, 6)
+
+
+def record_rating(session, rating, menu_item_id=None, combo_deal_id=None):
+    """Count one review in its target's summary inside the caller's transaction"""
+    keys = {"menu_item_id": menu_item_id} if menu_item_id is not None else {"combo_deal_id": combo_deal_id}
+    increment_row(
+        session,
+        RatingSummary.__table__,
+        keys,
+        {"count": 1, "rating_sum": rating, f"stars_{rating}": 1},
+    )
+
+
+def rating_payload(summary):
+    """Serialize a summary (or ``None`` for an unrated target) for API responses"""
+    if summary is None:
+        return {"count": 0, "average": None, "histogram": {str(s): 0 for s in STARS}}
+    return {
+        "count": summary.count,
+        "average": round(summary.rating_sum / summary.count, 2) if summary.count else None,
+        "histogram": {str(s): getattr(summary, f"stars_{s}") for s in STARS},
+    }
+
+
+def rebuild_rating_summaries(session):
+    """Recompute every summary from ``Review`` in one grouped scan; returns the summary count"""
+    rows = (
+        session.query(Review.menu_item_id, Review.combo_deal_id, Review.rating, func.count(Review.id))
+        .filter(Review.rating.between(1, 5))
+        .group_by(Review.menu_item_id, Review.combo_deal_id, Review.rating)
+        .all()
+    )
+
+    summaries = {}
+    for menu_item_id, combo_deal_id, rating, count in rows:
+        if menu_item_id is not None:
+            key = {"menu_item_id": menu_item_id, "combo_deal_id": None}
+        elif combo_deal_id is not None:
+            key = {"menu_item_id": None, "combo_deal_id": combo_deal_id}
+        else:
+            continue
+        summary = summaries.setdefault(
+            (key["menu_item_id"], key["combo_deal_id"]),
+            dict(key, count=0, rating_sum=0, **{f"stars_{s}": 0 for s in STARS}),
+        )
+        summary["count"] += count
+        summary["rating_sum"] += rating * count
+        summary[f"stars_{rating}"] += count
+
+    session.query(RatingSummary).delete()
+    if summaries:
+        session.execute(insert(RatingSummary.__table__), list(summaries.values()))
+    return len(summaries)
@@ -0,0 +1,155 @@
+"""
+Reservation capacity: per-slot seat counters, availability and atomic booking
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from src.models import Reservation, ReservationSlot
+
+
+class ReservationFull(Exception):
+    """Raised when a booking would push a slot past ``RESERVATION_CAPACITY``"""
+
+
+def _slot_minutes():
+    return current_app.config.get("RESERVATION_SLOT_MINUTES", 15)
+
+
+def occupied_slots(start):
+    """Slot starts covered by a seating that begins at ``start``"""
+    slot = _slot_minutes()
+    duration = current_app.config.get("RESERVATION_DURATION_MINUTES", 90)
+    return [start + timedelta(minutes=slot * i) for i in range(-(-duration // slot))]
+
+
+def opening_window(day):
+    """``(open, close)`` datetimes for ``day``, or None when closed that weekday"""
+    hours = current_app.config["RESERVATION_OPENING_HOURS"][day.weekday()]
+    if not hours:
+        return None
+    opens, closes = (datetime.combine(day, datetime.strptime(h, "%H:%M").time()) for h in hours)
+    if closes <= opens:
+        closes += timedelta(days=1)  # Open past midnight
+    return opens, closes
+
+
+def seating_times(day):
+    """Every start time on ``day`` whose full seating fits inside opening hours"""
+    window = opening_window(day)
+    if window is None:
+        return []
+    opens, closes = window
+    duration = timedelta(minutes=current_app.config.get("RESERVATION_DURATION_MINUTES", 90))
+    step = timedelta(minutes=_slot_minutes())
+    times = []
+    start = opens
+    while start + duration <= closes:
+        times.append(start)
+        start += step
+    return times
+
+
+def check_reservation_time(start):
+    """Raise ValueError unless ``start`` is a bookable seating time"""
+    slot = _slot_minutes()
+    if start.second or start.microsecond or (start.hour * 60 + start.minute) % slot:
+        raise ValueError(f"Reservations start on {slot}-minute boundaries")
+    if start <= datetime.now():
+        raise ValueError("Reservation time must be in the future")
+    duration = timedelta(minutes=current_app.config.get("RESERVATION_DURATION_MINUTES", 90))
+    # A seating after midnight may belong to the previous day's opening hours
+    for day in (start.date() - timedelta(days=1), start.date()):
+        window = opening_window(day)
+        if window and window[0] <= start and start + duration <= window[1]:
+            return
+    raise ValueError("Reservation time is outside opening hours")
+
+
+def slot_start(reservation_time):
+    """The slot a reservation counts from (older reservations were not slot-aligned)"""
+    slot = _slot_minutes()
+    start = reservation_time.replace(second=0, microsecond=0)
+    return start - timedelta(minutes=(start.hour * 60 + start.minute) % slot)
+
+
+def _ensure_slots(session, slots):
+    existing = set(session.scalars(select(ReservationSlot.slot_start).where(ReservationSlot.slot_start.in_(slots))))
+    for slot_start in slots:
+        if slot_start in existing:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(insert(ReservationSlot).values(slot_start=slot_start, booked=0))
+        except IntegrityError:
+            pass  # Another booking created it first
+
+
+def book_seats(session, start, party_size):
+    """Add ``party_size`` seats to every slot ``start`` occupies, inside the caller's transaction.
+
+    All slots are bumped by one conditional ``UPDATE ... WHERE booked + n <=
+    capacity``. If any slot is too full fewer rows match, and
+    ``ReservationFull`` is raised; the caller must roll back.
+    """
+    capacity = current_app.config.get("RESERVATION_CAPACITY", 40)
+    slots = occupied_slots(start)
+    _ensure_slots(session, slots)
+    updated = session.execute(
+        update(ReservationSlot)
+        .where(ReservationSlot.slot_start.in_(slots), ReservationSlot.booked + party_size <= capacity)
+        .values(booked=ReservationSlot.booked + party_size)
+    ).rowcount
+    if updated != len(slots):
+        raise ReservationFull()
+
+
+def release_seats(session, start, party_size):
+    """Give back ``party_size`` seats on every slot ``start`` occupies, inside the caller's transaction"""
+    session.execute(
+        update(ReservationSlot)
+        .where(ReservationSlot.slot_start.in_(occupied_slots(start)), ReservationSlot.booked >= party_size)
+        .values(booked=ReservationSlot.booked - party_size)
+    )
+
+
+def availability(session, day, window_from=None, window_to=None, party_size=1):
+    """Seats left for each seating time on ``day`` between ``window_from`` and ``window_to`` (times)"""
+    capacity = current_app.config.get("RESERVATION_CAPACITY", 40)
+    times = [
+        t for t in seating_times(day)
+        if (window_from is None or t.time() >= window_from) and (window_to is None or t.time() <= window_to)
+    ]
+    if not times:
+        return []
+    # One primary-key range scan covers every slot the listed seatings touch
+    booked = dict(session.execute(
+        select(ReservationSlot.slot_start, ReservationSlot.booked)
+        .where(ReservationSlot.slot_start >= times[0], ReservationSlot.slot_start <= occupied_slots(times[-1])[-1])
+    ).all())
+    now = datetime.now()
+    result = []
+    for start in times:
+        seats_left = max(capacity - max(booked.get(s, 0) for s in occupied_slots(start)), 0)
+        result.append({
+            'time': start.isoformat(timespec='minutes'),
+            'seats_left': seats_left,
+            'available': start > now and seats_left >= party_size,
+        })
+    return result
+
+
+def rebuild_reservation_slots(session):
+    """Recompute every slot counter from confirmed reservations; returns the slot count"""
+    booked = defaultdict(int)
+    rows = session.execute(
+        select(Reservation.reservation_time, Reservation.party_size).where(Reservation.status == "confirmed")
+    )
+    for reservation_time, party_size in rows:
+        for start in occupied_slots(slot_start(reservation_time)):
+            booked[start] += party_size
+    session.execute(delete(ReservationSlot))
+    if booked:
+        session.execute(insert(ReservationSlot), [{'slot_start': s, 'booked': n} for s, n in booked.items()])
+    return len(booked)
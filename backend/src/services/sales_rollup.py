@@ -0,0 +1,133 @@
+"""
+Incremental daily sales rollup and bucketed analytics over it
+"""
+from datetime import date, timedelta
+from sqlalchemy import func, insert
+from src.models import DailySales, Order
+from src.services.counters import increment_row
+
+ORDER_TYPES = ("pickup", "delivery")
+PAYMENT_METHODS = ("cash", "card")
+ROLLUP_COLUMNS = ["revenue", "order_count"] + [
+    f"{key}_{suffix}" for key in ORDER_TYPES + PAYMENT_METHODS for suffix in ("orders", "revenue")
+]
+
+
+def _increments(order_type, payment_method, amount, count=1):
+    """Column increments contributed by ``count`` orders worth ``amount``"""
+    values = {"revenue": amount, "order_count": count}
+    if order_type in ORDER_TYPES:
+        values[f"{order_type}_orders"] = count
+        values[f"{order_type}_revenue"] = amount
+    if payment_method in PAYMENT_METHODS:
+        values[f"{payment_method}_orders"] = count
+        values[f"{payment_method}_revenue"] = amount
+    return values
+
+
+def record_order_sale(session, order):
+    """Add a flushed order to its day's rollup row inside the caller's transaction"""
+    values = _increments(order.order_type, order.payment_method, order.total_amount)
+    increment_row(session, DailySales.__table__, {"day": order.created_at.date()}, values)
+
+
+def rebuild_daily_sales(session):
+    """Recompute the whole rollup from ``Order`` in one grouped scan; returns the day count"""
+    day_expr = func.date(Order.created_at)
+    rows = (
+        session.query(
+            day_expr,
+            Order.order_type,
+            Order.payment_method,
+            func.count(Order.id),
+            func.sum(Order.total_amount),
+        )
+        .group_by(day_expr, Order.order_type, Order.payment_method)
+        .all()
+    )
+
+    days = {}
+    for day, order_type, payment_method, count, amount in rows:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        # The bulk insert needs every column in every row, even on a day with no pickups (say)
+        totals = days.setdefault(day, dict.fromkeys(ROLLUP_COLUMNS, 0))
+        for key, value in _increments(order_type, payment_method, amount or 0, count).items():
+            totals[key] = totals.get(key, 0) + value
+
+    session.query(DailySales).delete()
+    if days:
+        session.execute(
+            insert(DailySales.__table__),
+            [dict(day=day, **totals) for day, totals in days.items()],
+        )
+    return len(days)
+
+
+def _add_months(day, months):
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def sales_buckets(period, today):
+    """Return ``[(start, end_exclusive, label)]`` oldest first for an analytics period"""
+    if period == "day":
+        # Last 30 days
+        return [
+            (d, d + timedelta(days=1), d.strftime("%m/%d"))
+            for d in (today - timedelta(days=i) for i in range(29, -1, -1))
+        ]
+    if period == "week":
+        # Last 12 weeks, Monday aligned, including the current week
+        this_week = today - timedelta(days=today.weekday())
+        return [
+            (d, d + timedelta(weeks=1), f"Week {d.strftime('%m/%d')}")
+            for d in (this_week - timedelta(weeks=i) for i in range(11, -1, -1))
+        ]
+    if period == "month":
+        # Last 12 calendar months
+        this_month = today.replace(day=1)
+        return [
+            (d, _add_months(d, 1), d.strftime("%b %Y"))
+            for d in (_add_months(this_month, -i) for i in range(11, -1, -1))
+        ]
+    if period == "year":
+        # Last 5 years
+        return [
+            (date(y, 1, 1), date(y + 1, 1, 1), str(y))
+            for y in range(today.year - 4, today.year + 1)
+        ]
+    return []
+
+
+def sales_series(session, period, today):
+    """Bucketed sales for ``period`` read from the rollup in a single query"""
+    buckets = sales_buckets(period, today)
+    if not buckets:
+        return []
+
+    rows = (
+        session.query(DailySales.day, DailySales.revenue, DailySales.order_count)
+        .filter(DailySales.day >= buckets[0][0], DailySales.day < buckets[-1][1])
+        .order_by(DailySales.day)
+        .all()
+    )
+
+    data = []
+    index = 0
+    for start, end, label in buckets:
+        sales = 0.0
+        orders = 0
+        while index < len(rows) and rows[index].day < end:
+            sales += rows[index].revenue
+            orders += rows[index].order_count
+            index += 1
+        data.append(
+            {
+                "date": start.isoformat(),
+                "sales": float(sales),
+                "orders": orders,
+                "label": label,
+            }
+        )
+    return data
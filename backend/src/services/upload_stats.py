@@ -0,0 +1,51 @@
+"""
+Counters for upload bytes served by Python versus handed to the front proxy
+"""
+import threading
+
+
+class UploadServingStats:
+    """Process-wide counters for ``/api/uploads`` responses"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.python_requests = 0
+            self.python_bytes = 0
+            self.offloaded_requests = 0
+            self.offloaded_bytes = 0
+            self.partial_requests = 0
+            self.not_modified = 0
+
+    def record(self, status, nbytes, offloaded=False):
+        with self._lock:
+            if status == 304:
+                self.not_modified += 1
+                return
+            if status == 206:
+                self.partial_requests += 1
+            if offloaded:
+                self.offloaded_requests += 1
+                self.offloaded_bytes += nbytes
+            else:
+                self.python_requests += 1
+                self.python_bytes += nbytes
+
+    def snapshot(self):
+        with self._lock:
+            total = self.python_bytes + self.offloaded_bytes
+            return {
+                "python_requests": self.python_requests,
+                "python_bytes": self.python_bytes,
+                "offloaded_requests": self.offloaded_requests,
+                "offloaded_bytes": self.offloaded_bytes,
+                "offloaded_ratio": round(self.offloaded_bytes / total, 4) if total else 0.0,
+                "partial_requests": self.partial_requests,
+                "not_modified": self.not_modified,
+            }
+
+
+upload_stats = UploadServingStats()
@@ -0,0 +1,123 @@
+"""
+Per-process LRU + TTL cache of user rows for the Flask-Login user loader
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import make_transient_to_detached
+from src.extension.db import db
+from src.models import User
+
+USER_COLUMNS = [c.key for c in User.__table__.columns]
+
+
+class LRUTTLCache:
+    """Bounded mapping whose entries expire ``ttl`` seconds after insertion"""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+user_cache = LRUTTLCache()
+# Kept apart from user_cache with a much shorter TTL: it bounds how long a
+# revoked token keeps working on workers that didn't see the invalidation
+token_versions = LRUTTLCache(ttl=5)
+
+
+def init_user_cache(app):
+    user_cache.maxsize = app.config["USER_CACHE_SIZE"]
+    user_cache.ttl = app.config["USER_CACHE_TTL"]
+    token_versions.maxsize = app.config["USER_CACHE_SIZE"]
+    token_versions.ttl = app.config["TOKEN_VERSION_TTL"]
+
+
+def current_token_version(user_id):
+    """``token_version`` of ``user_id``, or None if the user is gone.
+
+    Cached for ``TOKEN_VERSION_TTL`` seconds. Invalidation only reaches this
+    process, so other workers honour a revocation within that window.
+    """
+    ttl = current_app.config["TOKEN_VERSION_TTL"]
+    version = token_versions.get(user_id) if ttl else None
+    if version is None:
+        version = db.session.scalar(select(User.token_version).where(User.id == user_id))
+        if version is not None and ttl:
+            token_versions.set(user_id, version)
+    return version
+
+
+def load_cached_user(user_id):
+    """Return the ``User`` for ``user_id`` attached to the current session.
+
+    On a hit the cached column values are merged with ``load=False``, which
+    attaches the instance without issuing a query; relationships still load
+    lazily on access.
+    """
+    if not current_app.config["USER_CACHE_TTL"]:
+        return db.session.get(User, user_id)
+    values = user_cache.get(user_id)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            user_cache.set(user_id, {c: getattr(user, c) for c in USER_COLUMNS})
+        return user
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target):
+    # Safety net for profile changes made outside the explicit invalidation points
+    user_cache.invalidate(target.id)
+    token_versions.invalidate(target.id)
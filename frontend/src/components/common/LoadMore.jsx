@@ -0,0 +1,29 @@
+/**
+ * "Load more" button for cursor-paginated listings
+ */
+import React from 'react';
+
+const LoadMore = ({ hasMore, loading, onClick }) => {
+    if (!hasMore) return null;
+    return (
+        <div style={{ textAlign: 'center', marginTop: '2rem' }}>
+            <button
+                onClick={onClick}
+                disabled={loading}
+                style={{
+                    padding: '10px 25px',
+                    borderRadius: '30px',
+                    border: '2px solid var(--primary-color)',
+                    background: 'white',
+                    color: 'var(--primary-color)',
+                    fontWeight: 'bold',
+                    cursor: loading ? 'wait' : 'pointer'
+                }}
+            >
+                {loading ? 'Loading...' : 'Load more'}
+            </button>
+        </div>
+    );
+};
+
+export default React.memo(LoadMore);
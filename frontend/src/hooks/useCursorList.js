@@ -0,0 +1,32 @@
+/**
+ * Custom hook for listings paged with the X-Next-Cursor response header
+ */
+import { useState } from 'react';
+
+export const useCursorList = (fetchPage) => {
+    const [items, setItems] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    // fetchPage(cursor) resolves to an axios response; a missing cursor means the first page
+    const load = async (cursor) => {
+        const res = await fetchPage(cursor);
+        setItems(prev => (cursor ? [...prev, ...res.data] : res.data));
+        setNextCursor(res.headers['x-next-cursor'] || null);
+        return res;
+    };
+
+    const loadMore = async () => {
+        if (!nextCursor || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            await load(nextCursor);
+        } catch (err) {
+            console.error(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    return { items, setItems, reload: () => load(null), loadMore, hasMore: Boolean(nextCursor), loadingMore };
+};
@@ -1,19 +1,43 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import Swal from 'sweetalert2';
+import { useCursorList } from '../hooks/useCursorList';
+import LoadMore from '../components/common/LoadMore';
 
 const AdminOrders = () => {
-    const [orders, setOrders] = useState([]);
+    const { items: orders, setItems: setOrders, reload, loadMore, hasMore, loadingMore } = useCursorList(
+        (cursor) => axios.get('/api/admin/orders', { params: { cursor } })
+    );
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetchOrders();
+        let source;
+        let closed = false;
+        // Load the list once, then follow the live feed from the cursor it returned
+        fetchOrders().then((cursor) => {
+            if (closed) return;
+            source = new EventSource(`/api/admin/orders/feed?cursor=${cursor || 0}`);
+            source.addEventListener('order', (e) => {
+                const change = JSON.parse(e.data);
+                if (change.kind === 'created') {
+                    setOrders(prev => [change.data, ...prev.filter(o => o.id !== change.order_id)]);
+                } else {
+                    setOrders(prev => prev.map(o => o.id === change.order_id ? { ...o, status: change.data.status } : o));
+                }
+            });
+            // Sent when we fell too far behind to replay; reload the list
+            source.addEventListener('reset', () => fetchOrders());
+        });
+        return () => {
+            closed = true;
+            if (source) source.close();
+        };
     }, []);
 
     const fetchOrders = async () => {
         try {
-            const res = await axios.get('/api/admin/orders');
-            setOrders(res.data);
+            const res = await reload();
+            return res.headers['x-order-feed-cursor'];
         } catch (err) {
             console.error(err);
         } finally {
@@ -35,7 +59,17 @@ const AdminOrders = () => {
         try {
             await axios.patch(`/api/admin/orders/${orderId}/status`, { status: newStatus });
             Swal.fire('Success', `Order marked as ${newStatus.replace(/_/g, ' ')}`, 'success');
-            fetchOrders();
+        } catch (err) {
+            Swal.fire('Error', 'Failed to update status', 'error');
+        }
+    };
+
+    const handleBulkReady = async () => {
+        const ids = orders.filter(o => o.status === 'preparing').map(o => o.id);
+        try {
+            const res = await axios.post('/api/admin/orders/status', { ids, status: 'ready', from: 'preparing' });
+            const { updated, conflicts } = res.data;
+            Swal.fire('Success', `${updated} order(s) marked as ready${conflicts ? `, ${conflicts} skipped` : ''}`, 'success');
         } catch (err) {
             Swal.fire('Error', 'Failed to update status', 'error');
         }
@@ -43,9 +77,18 @@ const AdminOrders = () => {
 
     if (loading) return <div style={{ textAlign: 'center', padding: '5rem' }}>Loading orders...</div>;
 
+    const preparingCount = orders.filter(o => o.status === 'preparing').length;
+
     return (
         <div style={{ padding: '4rem 2rem', maxWidth: '1200px', margin: '0 auto' }}>
-            <h1 style={{ marginBottom: '2rem', fontSize: '2.5rem', fontWeight: '900' }}>Manage Orders</h1>
+            <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', flexWrap: 'wrap', gap: '10px', marginBottom: '2rem' }}>
+                <h1 style={{ margin: 0, fontSize: '2.5rem', fontWeight: '900' }}>Manage Orders</h1>
+                {preparingCount > 1 && (
+                    <button onClick={handleBulkReady} style={{ ...btnBase, background: '#2196F3', color: 'white' }}>
+                        Mark all {preparingCount} preparing as ready
+                    </button>
+                )}
+            </div>
 
             <div style={{ display: 'grid', gap: '1.5rem' }}>
                 {orders.map(order => (
@@ -107,6 +150,7 @@ const AdminOrders = () => {
                 ))}
             </div>
             {orders.length === 0 && <p style={{ textAlign: 'center', color: '#666' }}>No orders found.</p>}
+            <LoadMore hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
         </div>
     );
 };
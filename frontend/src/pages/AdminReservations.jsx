@@ -1,9 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import Swal from 'sweetalert2';
+import { useCursorList } from '../hooks/useCursorList';
+import LoadMore from '../components/common/LoadMore';
 
 const AdminReservations = () => {
-    const [reservations, setReservations] = useState([]);
+    const { items: reservations, setItems: setReservations, reload, loadMore, hasMore, loadingMore } = useCursorList(
+        (cursor) => axios.get('/api/admin/reservations', { params: { cursor } })
+    );
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
@@ -12,8 +16,7 @@ const AdminReservations = () => {
 
     const fetchReservations = async () => {
         try {
-            const res = await axios.get('/api/admin/reservations');
-            setReservations(res.data);
+            await reload();
         } catch (err) {
             console.error(err);
         } finally {
@@ -25,7 +28,8 @@ const AdminReservations = () => {
         try {
             await axios.patch(`/api/admin/reservations/${resId}/status`, { status: newStatus });
             Swal.fire('Success', `Reservation marked as ${newStatus}`, 'success');
-            fetchReservations();
+            // Update in place so the pages loaded so far stay on screen
+            setReservations(prev => prev.map(r => r.id === resId ? { ...r, status: newStatus } : r));
         } catch (err) {
             Swal.fire('Error', 'Failed to update status', 'error');
         }
@@ -103,6 +107,7 @@ const AdminReservations = () => {
                     <p>No reservations found.</p>
                 </div>
             )}
+            <LoadMore hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
         </div>
     );
 };
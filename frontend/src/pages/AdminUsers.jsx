@@ -1,9 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import Swal from 'sweetalert2';
+import { useCursorList } from '../hooks/useCursorList';
+import LoadMore from '../components/common/LoadMore';
 
 const AdminUsers = () => {
-    const [users, setUsers] = useState([]);
+    const { items: users, setItems: setUsers, reload, loadMore, hasMore, loadingMore } = useCursorList(
+        (cursor) => axios.get('/api/admin/users', { params: { cursor } })
+    );
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
@@ -12,8 +16,7 @@ const AdminUsers = () => {
 
     const fetchUsers = async () => {
         try {
-            const res = await axios.get('/api/admin/users');
-            setUsers(res.data);
+            await reload();
         } catch (err) {
             console.error(err);
         } finally {
@@ -37,7 +40,8 @@ const AdminUsers = () => {
             try {
                 await axios.patch(`/api/admin/users/${userId}/role`, { role: newRole });
                 Swal.fire('Updated!', `User is now a ${newRole}.`, 'success');
-                fetchUsers();
+                // Update in place so the pages loaded so far stay on screen
+                setUsers(prev => prev.map(u => u.id === userId ? { ...u, role: newRole } : u));
             } catch (err) {
                 Swal.fire('Error', 'Failed to update role', 'error');
             }
@@ -100,6 +104,7 @@ const AdminUsers = () => {
                     </tbody>
                 </table>
             </div>
+            <LoadMore hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
         </div>
     );
 };
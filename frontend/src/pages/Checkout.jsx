@@ -62,6 +62,7 @@ const Checkout = () => {
                     price: i.price
                 })),
                 total: finalTotal,
+                coupon: appliedCoupon?.code,
                 payment,
                 type
             });
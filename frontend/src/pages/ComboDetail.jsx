@@ -4,33 +4,33 @@ import axios from 'axios';
 import Swal from 'sweetalert2';
 import { useCart } from '../context/CartContext';
 
-// Customization options
+// Customization options; choices are free, the server charges the combo price only
 const CUSTOMIZATIONS = {
     sauces: [
-        { id: 'ketchup', name: 'Ketchup', price: 0 },
-        { id: 'mayo', name: 'Mayonnaise', price: 0 },
-        { id: 'bbq', name: 'BBQ Sauce', price: 0.50 },
-        { id: 'ranch', name: 'Ranch', price: 0.50 },
-        { id: 'sriracha', name: 'Sriracha Mayo', price: 0.75 },
-        { id: 'garlic', name: 'Garlic Aioli', price: 0.75 }
+        { id: 'ketchup', name: 'Ketchup' },
+        { id: 'mayo', name: 'Mayonnaise' },
+        { id: 'bbq', name: 'BBQ Sauce' },
+        { id: 'ranch', name: 'Ranch' },
+        { id: 'sriracha', name: 'Sriracha Mayo' },
+        { id: 'garlic', name: 'Garlic Aioli' }
     ],
     sides: [
-        { id: 'fries', name: 'French Fries', price: 0 },
-        { id: 'onion_rings', name: 'Onion Rings', price: 1.50 },
-        { id: 'coleslaw', name: 'Coleslaw', price: 1.00 },
-        { id: 'salad', name: 'Side Salad', price: 2.00 },
-        { id: 'sweet_potato', name: 'Sweet Potato Fries', price: 1.50 }
+        { id: 'fries', name: 'French Fries' },
+        { id: 'onion_rings', name: 'Onion Rings' },
+        { id: 'coleslaw', name: 'Coleslaw' },
+        { id: 'salad', name: 'Side Salad' },
+        { id: 'sweet_potato', name: 'Sweet Potato Fries' }
     ],
     drinks: [
-        { id: 'coke', name: 'Coca-Cola', price: 0 },
-        { id: 'sprite', name: 'Sprite', price: 0 },
-        { id: 'fanta', name: 'Fanta', price: 0 },
-        { id: 'water', name: 'Mineral Water', price: 0 },
-        { id: 'iced_tea', name: 'Iced Tea', price: 0.50 }
+        { id: 'coke', name: 'Coca-Cola' },
+        { id: 'sprite', name: 'Sprite' },
+        { id: 'fanta', name: 'Fanta' },
+        { id: 'water', name: 'Mineral Water' },
+        { id: 'iced_tea', name: 'Iced Tea' }
     ],
     sizes: [
-        { id: 'regular', name: 'Regular', price: 0 },
-        { id: 'large', name: 'Large (+50%)', price: 3.00 }
+        { id: 'regular', name: 'Regular' },
+        { id: 'large', name: 'Large' }
     ]
 };
 
@@ -57,23 +57,12 @@ const ComboDetail = () => {
         return <div style={{ padding: '60px', textAlign: 'center' }}>Loading...</div>;
     }
 
-    const getExtraPrice = () => {
-        let extra = 0;
-        extra += CUSTOMIZATIONS.sauces.find(s => s.id === selectedOptions.sauce)?.price || 0;
-        extra += CUSTOMIZATIONS.sides.find(s => s.id === selectedOptions.side)?.price || 0;
-        extra += CUSTOMIZATIONS.drinks.find(s => s.id === selectedOptions.drink)?.price || 0;
-        extra += CUSTOMIZATIONS.sizes.find(s => s.id === selectedOptions.size)?.price || 0;
-        return extra;
-    };
-
-    const totalPrice = combo.combo_price + getExtraPrice();
-
     const handleAddToCart = () => {
         // Add combo with customizations
         addToCart({
             id: `combo-${combo.id}-${Date.now()}`,
             name: combo.name,
-            price: totalPrice,
+            price: combo.combo_price,
             image_url: combo.image_url,
             isCombo: true,
             customizations: {
@@ -201,7 +190,7 @@ const ComboDetail = () => {
                                 onClick={() => setSelectedOptions({ ...selectedOptions, sauce: sauce.id })}
                                 style={optionButtonStyle(selectedOptions.sauce === sauce.id)}
                             >
-                                {sauce.name} {sauce.price > 0 && `(+$${sauce.price.toFixed(2)})`}
+                                {sauce.name}
                             </button>
                         ))}
                     </div>
@@ -217,7 +206,7 @@ const ComboDetail = () => {
                                 onClick={() => setSelectedOptions({ ...selectedOptions, side: side.id })}
                                 style={optionButtonStyle(selectedOptions.side === side.id)}
                             >
-                                {side.name} {side.price > 0 && `(+$${side.price.toFixed(2)})`}
+                                {side.name}
                             </button>
                         ))}
                     </div>
@@ -233,7 +222,7 @@ const ComboDetail = () => {
                                 onClick={() => setSelectedOptions({ ...selectedOptions, drink: drink.id })}
                                 style={optionButtonStyle(selectedOptions.drink === drink.id)}
                             >
-                                {drink.name} {drink.price > 0 && `(+$${drink.price.toFixed(2)})`}
+                                {drink.name}
                             </button>
                         ))}
                     </div>
@@ -249,7 +238,7 @@ const ComboDetail = () => {
                                 onClick={() => setSelectedOptions({ ...selectedOptions, size: size.id })}
                                 style={optionButtonStyle(selectedOptions.size === size.id)}
                             >
-                                {size.name} {size.price > 0 && `(+$${size.price.toFixed(2)})`}
+                                {size.name}
                             </button>
                         ))}
                     </div>
@@ -285,16 +274,10 @@ const ComboDetail = () => {
                         <span>Combo Price:</span>
                         <span>${combo.combo_price.toFixed(2)}</span>
                     </div>
-                    {getExtraPrice() > 0 && (
-                        <div style={{ display: 'flex', justifyContent: 'space-between', marginBottom: '10px', color: 'var(--secondary-color)' }}>
-                            <span>Customizations:</span>
-                            <span>+${getExtraPrice().toFixed(2)}</span>
-                        </div>
-                    )}
                     <hr style={{ border: 'none', borderTop: '1px solid #ddd', margin: '10px 0' }} />
                     <div style={{ display: 'flex', justifyContent: 'space-between', fontWeight: 'bold', fontSize: '1.3rem' }}>
                         <span>Total:</span>
-                        <span style={{ color: 'var(--primary-color)' }}>${totalPrice.toFixed(2)}</span>
+                        <span style={{ color: 'var(--primary-color)' }}>${combo.combo_price.toFixed(2)}</span>
                     </div>
                 </div>
 
@@ -313,7 +296,7 @@ const ComboDetail = () => {
                         boxShadow: '0 5px 20px rgba(211, 47, 47, 0.3)'
                     }}
                 >
-                    Add to Cart - ${totalPrice.toFixed(2)}
+                    Add to Cart - ${combo.combo_price.toFixed(2)}
                 </button>
             </div>
         </div>
@@ -247,16 +247,28 @@ const Deals = memo(() => {
               to={`/deals/${combo.id}`}
               style={{ textDecoration: "none", color: "inherit" }}
             >
-              <img
-                src={combo.image_url}
-                alt={combo.name}
-                style={{
-                  width: "100%",
-                  height: "200px",
-                  objectFit: "cover",
-                  cursor: "pointer",
-                }}
-              />
+              <picture style={{ display: "block" }}>
+                {combo.image_variants && (
+                  <source
+                    type="image/webp"
+                    srcSet={combo.image_variants.webp_srcset}
+                    sizes="(max-width: 768px) 100vw, 400px"
+                  />
+                )}
+                <img
+                  src={combo.image_url}
+                  srcSet={combo.image_variants?.srcset}
+                  sizes="(max-width: 768px) 100vw, 400px"
+                  alt={combo.name}
+                  loading="lazy"
+                  style={{
+                    width: "100%",
+                    height: "200px",
+                    objectFit: "cover",
+                    cursor: "pointer",
+                  }}
+                />
+              </picture>
 
               <div style={{ padding: "25px 25px 0 25px" }}>
                 <div
@@ -187,11 +187,23 @@ const Menu = memo(() => {
               style={{ textDecoration: "none", color: "inherit" }}
             >
               {item.image_url && (
-                <img
-                  src={item.image_url}
-                  alt={item.name}
-                  style={{ width: "100%", height: "200px", objectFit: "cover" }}
-                />
+                <picture style={{ display: "block" }}>
+                  {item.image_variants && (
+                    <source
+                      type="image/webp"
+                      srcSet={item.image_variants.webp_srcset}
+                      sizes="(max-width: 768px) 100vw, 400px"
+                    />
+                  )}
+                  <img
+                    src={item.image_url}
+                    srcSet={item.image_variants?.srcset}
+                    sizes="(max-width: 768px) 100vw, 400px"
+                    alt={item.name}
+                    loading="lazy"
+                    style={{ width: "100%", height: "200px", objectFit: "cover" }}
+                  />
+                </picture>
               )}
               <div style={{ padding: "20px 20px 0 20px" }}>
                 <div
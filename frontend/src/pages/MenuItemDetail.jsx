@@ -5,6 +5,8 @@ import api from "../services/api/api";
 import { useCart } from "../context/CartContext";
 import { useAuth } from "../context/AuthContext";
 import Loading from "../components/common/Loading";
+import LoadMore from "../components/common/LoadMore";
+import { useCursorList } from "../hooks/useCursorList";
 
 const MenuItemDetail = memo(() => {
   const { id } = useParams();
@@ -436,12 +438,13 @@ const MenuItemDetail = memo(() => {
 });
 
 const ReviewsList = memo(({ itemId }) => {
-  const [reviews, setReviews] = useState([]);
+  const { items: reviews, reload, loadMore, hasMore, loadingMore } = useCursorList(
+    (cursor) => api.get(`/menu/${itemId}/reviews`, { params: { cursor } })
+  );
   useEffect(() => {
     const fetchReviews = async () => {
       try {
-        const res = await api.get(`/menu/${itemId}/reviews`);
-        setReviews(res.data);
+        await reload();
       } catch (err) {
         console.error("Failed to fetch reviews:", err);
       }
@@ -481,6 +484,7 @@ const ReviewsList = memo(({ itemId }) => {
       {reviews.length === 0 && (
         <p style={{ color: "#999", fontSize: "0.9rem" }}>No reviews yet.</p>
       )}
+      <LoadMore hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
     </div>
   );
 });
@@ -34,7 +34,7 @@ const Reservations = () => {
         } catch (err) {
             Swal.fire({
                 title: 'Failed',
-                text: 'Reservation failed. Please try again.',
+                text: err.response?.data?.message || 'Reservation failed. Please try again.',
                 icon: 'error',
                 confirmButtonColor: 'var(--primary-color)'
             });
@@ -77,6 +77,7 @@ const Reservations = () => {
                         <label style={{ fontWeight: 'bold', fontSize: '0.9rem' }}>Date & Time</label>
                         <input
                             type="datetime-local"
+                            step="900"
                             value={formData.time}
                             onChange={(e) => setFormData({ ...formData, time: e.target.value })}
                             required
@@ -3,9 +3,13 @@ import axios from 'axios';
 import Swal from 'sweetalert2';
 import { useAuth } from '../context/AuthContext';
 import { useSearchParams } from 'react-router-dom';
+import { useCursorList } from '../hooks/useCursorList';
+import LoadMore from '../components/common/LoadMore';
 
 const Reviews = () => {
-    const [reviews, setReviews] = useState([]);
+    const { items: reviews, reload, loadMore, hasMore, loadingMore } = useCursorList(
+        (cursor) => axios.get('/api/reviews', { params: { cursor } })
+    );
     const [loading, setLoading] = useState(true);
     const [menuItems, setMenuItems] = useState([]);
     const [combos, setCombos] = useState([]);
@@ -32,8 +36,7 @@ const Reviews = () => {
 
     const fetchReviews = async () => {
         try {
-            const res = await axios.get('/api/reviews');
-            setReviews(res.data);
+            await reload();
         } catch (err) {
             console.error('Failed to fetch reviews', err);
         } finally {
@@ -204,6 +207,7 @@ const Reviews = () => {
             {reviews.length === 0 && (
                 <p style={{ textAlign: 'center', color: '#777', padding: '50px' }}>No reviews yet. Be the first to review!</p>
             )}
+            <LoadMore hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
         </div>
     );
 };